@@ -1,34 +1,2517 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, Text
-from tkcalendar import Calendar
+import time
+
+STARTED_AT = time.perf_counter()
+
 from datetime import datetime, timedelta
+import argparse
+import atexit
+import calendar
+import contextlib
+import csv
+import hashlib
 import json
 import os
+import signal
 import subprocess
-from plyer import notification
+import sys
 import threading
-import time
+import queue
+import re
+import shutil
 import heapq
+import bisect
+import itertools
 import logging
+import logging.handlers
+import mimetypes
+import sqlite3
+import uuid
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 TASKS_FILE = "tasks.json"
+JOURNAL_FILE = "tasks.journal"
+DB_FILE = "tasks.db"
+STORAGE_MODE = os.environ.get("TASKSCHEDULER_STORAGE", "journal")
 LOG_FILE = "executed_tasks.txt"
 DEBUG_LOG = "scheduler_debug.log"
+LOG_LEVEL = os.environ.get("TASKSCHEDULER_LOG_LEVEL", "INFO")
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+TRACE_ENABLED = os.environ.get("TASKSCHEDULER_TRACE", "") not in ("", "0")
+METRICS_PORT = int(os.environ.get("TASKSCHEDULER_METRICS_PORT", "0")) or None
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+LAG_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0)
+REMINDER_BATCH_WINDOW = 2
+REMINDER_MIN_INTERVAL = 30
+REMINDER_SUMMARY_LINES = 5
+OFFSET_UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+FSYNC_INTERVAL = 0.05
+COMPACT_THRESHOLD = 1000
+SYNC_INTERVAL = 1.0
+LEASE_SECONDS = 10.0
+STARTUP_TARGET_MS = float(os.environ.get("TASKSCHEDULER_STARTUP_TARGET_MS", "500"))
+PRIORITY_MAP = {"High": 1, "Medium": 2, "Low": 3}
+RECURRENCE_PERIODS = {"daily": "day", "weekly": "week", "monthly": "month"}
+REQUIRED_KEYS = {"name", "due_date", "due_time", "status", "priority"}
+SEARCH_DELAY_MS = 150
+FILTER_SCAN_CHUNK = 2048
+PREFIX_MIN_LENGTH = 3
+TOKEN_PATTERN = re.compile(r"\w+")
+EXPORT_FIELDS = ["id", "name", "description", "due_date", "due_time", "priority", "status", "files", "recurrence", "occurrence", "remind", "depends"]
+LOAD_CHUNK_SIZE = 1 << 16
+NOTIFY_WORKERS = 2
+NOTIFY_QUEUE_SIZE = 1000
+IO_QUEUE_SIZE = 10000
+IO_DRAIN_TIMEOUT = 600.0
+ATTACHMENTS_DIR = "attachments"
+ATTACHMENT_MODE = os.environ.get("TASKSCHEDULER_ATTACHMENTS", "copy")
+HASH_CHUNK_SIZE = 1 << 20
+
+PRIORITY_NAMES = {rank: name for name, rank in PRIORITY_MAP.items()}
+
+def parse_offsets(text):
+    offsets = set()
+    for part in text.replace(" ", "").lower().split(","):
+        if not part:
+            continue
+        if part[-1] in OFFSET_UNITS and part[:-1].isdigit():
+            offsets.add(int(part[:-1]) * OFFSET_UNITS[part[-1]])
+        elif part.isdigit():
+            offsets.add(int(part) * 60)
+        else:
+            raise ValueError(f"Invalid reminder offset: {part}")
+    if 0 in offsets:
+        raise ValueError("Reminder offsets must be greater than zero")
+    return tuple(sorted(offsets, reverse=True))
+
+def format_offset(seconds):
+    for unit, size in OFFSET_UNITS.items():
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+
+def format_duration(seconds):
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return "less than a minute"
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        count = round(seconds / size)
+        if count >= 1 and (unit == "minute" or seconds >= size - size // 120):
+            return f"{count} {unit}{'s' if count != 1 else ''}"
+
+def read_reminder_defaults(text):
+    defaults = {1: parse_offsets("1d,1h,5m"), 2: parse_offsets("1h,5m"), 3: parse_offsets("1h")}
+    for part in text.split(";"):
+        if "=" not in part:
+            continue
+        name, offsets = part.split("=", 1)
+        if name.strip() in PRIORITY_MAP:
+            defaults[PRIORITY_MAP[name.strip()]] = parse_offsets(offsets)
+    return defaults
+
+REMINDER_OFFSETS = read_reminder_defaults(os.environ.get("TASKSCHEDULER_REMINDERS", ""))
+
+logger = logging.getLogger("TaskScheduler")
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record):
+        message = super().format(record)
+        if record.levelno >= logging.ERROR:
+            return f"Error: {message}"
+        if record.levelno >= logging.WARNING:
+            return f"Warning: {message}"
+        return message
+
+def setup_logging(level=LOG_LEVEL, console=True, trace=TRACE_ENABLED):
+    file_handler = logging.handlers.RotatingFileHandler(DEBUG_LOG, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(threadName)s - %(message)s"))
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(ConsoleFormatter("%(message)s"))
+        handlers.append(console_handler)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
+    tracer.enabled = trace
+    return listener
+
+class TraceSpan:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class Tracer:
+    def __init__(self, registry, enabled=False):
+        self.registry = registry
+        self.enabled = enabled
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.idle = contextlib.nullcontext()
+
+    def span(self, name):
+        if not self.enabled:
+            return self.idle
+        return TraceSpan(self, name)
+
+    def record(self, name, seconds):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms[name] = self.registry.histogram(f"taskscheduler_trace_{name.replace('.', '_')}_seconds", f"Traced latency of {name}")
+        histogram.observe(seconds)
+
+    def report(self):
+        with self.lock:
+            items = sorted(self.histograms.items())
+        for name, histogram in items:
+            logger.info("Trace %s: %s", name, histogram.summary())
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self):
+        yield self.name, self.value
+
+    def summary(self):
+        return str(self.value)
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name, help, fn=None):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self.fn = fn
+
+    def set(self, value):
+        self.value = value
+
+    def get(self):
+        if self.fn is None:
+            return self.value
+        try:
+            return self.fn()
+        except Exception:
+            return float("nan")
+
+    def samples(self):
+        yield self.name, self.get()
+
+    def summary(self):
+        return str(self.get())
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        with self.lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def samples(self):
+        with self.lock:
+            counts = list(self.counts)
+            count, total = self.count, self.total
+        cumulative = 0
+        for bound, hits in zip(self.bounds + (float("inf"),), counts):
+            cumulative += hits
+            yield f'{self.name}_bucket{{le="{"+Inf" if bound == float("inf") else bound}"}}', cumulative
+        yield f"{self.name}_sum", total
+        yield f"{self.name}_count", count
+
+    def quantile(self, fraction):
+        with self.lock:
+            counts = list(self.counts)
+            count, largest = self.count, self.max
+        seen = 0
+        for bound, hits in zip(self.bounds + (float("inf"),), counts):
+            seen += hits
+            if count and seen >= fraction * count:
+                return min(bound, largest)
+        return 0.0
+
+    def summary(self):
+        if not self.count:
+            return "no samples"
+        return (f"n={self.count} mean={self.total / self.count * 1e3:.3f}ms p50<={self.quantile(0.5) * 1e3:.3f}ms "
+                f"p90<={self.quantile(0.9) * 1e3:.3f}ms p99<={self.quantile(0.99) * 1e3:.3f}ms max={self.max * 1e3:.3f}ms")
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, cls, name, *args):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, *args)
+            return metric
+
+    def counter(self, name, help):
+        return self._register(Counter, name, help)
+
+    def gauge(self, name, help, fn=None):
+        gauge = self._register(Gauge, name, help)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, help, buckets)
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.metrics.items())
+        lines = []
+        for name, metric in items:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {'NaN' if value != value else value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        with self.lock:
+            items = sorted(self.metrics.items())
+        return [f"{name.replace('taskscheduler_', '', 1)}: {metric.summary()}" for name, metric in items]
+
+metrics = MetricsRegistry()
+tracer = Tracer(metrics, TRACE_ENABLED)
+TASKS_ADDED = metrics.counter("taskscheduler_tasks_added_total", "Tasks added")
+TASKS_COMPLETED = metrics.counter("taskscheduler_tasks_completed_total", "Tasks or occurrences marked completed")
+TASKS_DELETED = metrics.counter("taskscheduler_tasks_deleted_total", "Tasks deleted")
+NOTIFICATIONS_SENT = metrics.counter("taskscheduler_notifications_sent_total", "Notifications delivered to the sink")
+NOTIFICATIONS_FAILED = metrics.counter("taskscheduler_notifications_failed_total", "Notifications the sink failed to deliver")
+REMINDERS_FIRED = metrics.counter("taskscheduler_reminders_fired_total", "Reminder stages that fired, before coalescing")
+NOTIFICATION_LAG = metrics.histogram("taskscheduler_notification_lag_seconds", "How late reminders reach the sink versus their scheduled time", LAG_BUCKETS)
+STORE_WRITE_SECONDS = metrics.histogram("taskscheduler_store_write_seconds", "Latency of saving or deleting one task in the store")
+STORE_ERRORS = metrics.counter("taskscheduler_store_errors_total", "Failed task saves and deletions")
+FSYNC_SECONDS = metrics.histogram("taskscheduler_journal_fsync_seconds", "Latency of journal group fsyncs")
+COMPACTION_SECONDS = metrics.histogram("taskscheduler_compaction_seconds", "Duration of snapshot compactions", LAG_BUCKETS)
+
+def metrics_handler():
+    import http.server
+
+    class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = self.server.registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug("Metrics request from %s: " + format, self.address_string(), *args)
+
+    return http.server.ThreadingHTTPServer, MetricsRequestHandler
+
+class MetricsServer:
+    def __init__(self, registry, port, host="127.0.0.1"):
+        server_class, handler = metrics_handler()
+        self.server = server_class((host, port), handler)
+        self.server.daemon_threads = True
+        self.server.registry = registry
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.server.server_address[:2]
+        logger.info("Serving metrics on http://%s:%s/metrics", host, port)
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def parse_due(due_date, due_time):
+    if len(due_date) == 10 and len(due_time) == 5 and due_date[4] == due_date[7] == "-" and due_time[2] == ":":
+        try:
+            return int(datetime(int(due_date[:4]), int(due_date[5:7]), int(due_date[8:]), int(due_time[:2]), int(due_time[3:])).timestamp())
+        except ValueError:
+            pass
+    return int(datetime.strptime(f"{due_date} {due_time}", "%Y-%m-%d %H:%M").timestamp())
+
+class Recurrence:
+    __slots__ = ("freq", "start", "interval", "count", "until")
+
+    def __init__(self, freq, start, interval=1, count=None, until=None):
+        if freq not in RECURRENCE_PERIODS:
+            raise ValueError(f"Unknown recurrence frequency: {freq}")
+        if not isinstance(interval, int) or interval < 1:
+            raise ValueError(f"Invalid recurrence interval: {interval}")
+        if count is not None and (not isinstance(count, int) or count < 1):
+            raise ValueError(f"Invalid recurrence count: {count}")
+        self.freq = freq
+        self.start = start
+        self.interval = interval
+        self.count = count
+        self.until = until
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or not isinstance(data.get("start"), str) or not isinstance(data.get("until") or "", str):
+            raise ValueError(f"Invalid recurrence: {data}")
+        start_date, start_time = data["start"].split(" ")
+        until = parse_due(data["until"], "23:59") if data.get("until") else None
+        return cls(data["freq"], parse_due(start_date, start_time), data.get("interval", 1), data.get("count"), until)
+
+    def to_dict(self):
+        data = {"freq": self.freq, "interval": self.interval, "start": time.strftime("%Y-%m-%d %H:%M", time.localtime(self.start))}
+        if self.count is not None:
+            data["count"] = self.count
+        if self.until is not None:
+            data["until"] = time.strftime("%Y-%m-%d", time.localtime(self.until))
+        return data
+
+    def occurrence(self, index):
+        start = datetime.fromtimestamp(self.start)
+        if self.freq == "monthly":
+            year, month = divmod(start.month - 1 + index * self.interval, 12)
+            year += start.year
+            month += 1
+            day = min(start.day, calendar.monthrange(year, month)[1])
+            return int(start.replace(year=year, month=month, day=day).timestamp())
+        days = index * self.interval * (7 if self.freq == "weekly" else 1)
+        return int((start + timedelta(days=days)).timestamp())
+
+    def first_after(self, moment, index):
+        if self.freq != "monthly":
+            period = self.interval * (7 if self.freq == "weekly" else 1) * 86400
+            index = max(index, int((moment - self.start) // period) - 1)
+        while self.count is None or index < self.count:
+            due = self.occurrence(index)
+            if self.until is not None and due > self.until:
+                return None
+            if due > moment:
+                return index, due
+            index += 1
+        return None
+
+    def describe(self):
+        period = RECURRENCE_PERIODS[self.freq]
+        text = f"every {period}" if self.interval == 1 else f"every {self.interval} {period}s"
+        if self.count is not None:
+            text += f", {self.count} times"
+        if self.until is not None:
+            text += f", until {time.strftime('%Y-%m-%d', time.localtime(self.until))}"
+        return text
+
+class Task:
+    __slots__ = ("id", "name", "due", "priority", "status", "description", "files", "recurrence", "occurrence", "remind", "depends", "extra")
+    FIELDS = ("id", "name", "description", "due_date", "due_time", "priority", "status", "files", "recurrence", "occurrence", "remind", "depends")
+
+    def __init__(self, id, name, due, priority, status="Pending", description="", files=None, recurrence=None, occurrence=0, remind=None, depends=(), extra=None):
+        self.id = id
+        self.name = name
+        self.due = due
+        self.priority = priority
+        self.status = status
+        self.description = description
+        self.files = files if files is not None else []
+        self.recurrence = recurrence
+        self.occurrence = occurrence
+        self.remind = remind
+        self.depends = tuple(dict.fromkeys(depends))
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        if data["priority"] not in PRIORITY_MAP:
+            raise ValueError(f"Unknown priority: {data['priority']}")
+        extra = {key: value for key, value in data.items() if key not in cls.FIELDS}
+        return cls(
+            data["id"],
+            data["name"],
+            parse_due(data["due_date"], data["due_time"]),
+            PRIORITY_MAP[data["priority"]],
+            data["status"],
+            data.get("description", ""),
+            list(data.get("files", [])),
+            Recurrence.from_dict(data["recurrence"]) if data.get("recurrence") else None,
+            int(data.get("occurrence", 0)),
+            parse_offsets(",".join(data["remind"])) if data.get("remind") is not None else None,
+            tuple(data.get("depends", ())),
+            extra or None
+        )
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "due_date": self.due_date,
+            "due_time": self.due_time,
+            "priority": self.priority_name,
+            "status": self.status,
+            "files": list(self.files)
+        }
+        if self.recurrence is not None:
+            data["recurrence"] = self.recurrence.to_dict()
+            data["occurrence"] = self.occurrence
+        if self.remind is not None:
+            data["remind"] = [format_offset(offset) for offset in self.remind]
+        if self.depends:
+            data["depends"] = list(self.depends)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def due_date(self):
+        return time.strftime("%Y-%m-%d", time.localtime(self.due))
+
+    @property
+    def due_time(self):
+        return time.strftime("%H:%M", time.localtime(self.due))
+
+    @property
+    def priority_name(self):
+        return PRIORITY_NAMES[self.priority]
+
+    @property
+    def reminder_offsets(self):
+        return self.remind if self.remind is not None else REMINDER_OFFSETS[self.priority]
+
+    def advance(self, moment):
+        if self.recurrence is None:
+            return False
+        upcoming = self.recurrence.first_after(moment, self.occurrence + 1)
+        if upcoming is None:
+            return False
+        self.occurrence, self.due = upcoming
+        return True
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.name!r}, due={self.due_date} {self.due_time}, priority={self.priority_name}, status={self.status})"
+
+def iter_json_records(f, on_read=None):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    in_array = None
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer):
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                if in_array:
+                    pos += 1
+                    continue
+            if in_array and buffer[pos] == "]":
+                return
+            try:
+                record, pos = decoder.raw_decode(buffer, pos)
+                yield record
+                continue
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+        elif eof:
+            return
+        chunk = f.read(LOAD_CHUNK_SIZE)
+        if on_read is not None:
+            on_read(len(chunk))
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+def validate_task(task, seen_ids=None):
+    if not isinstance(task, dict):
+        return None
+    if not all(key in task for key in REQUIRED_KEYS):
+        return None
+    if not isinstance(task["name"], str) or not task["name"].strip():
+        return None
+    if task["status"] not in ["Pending", "Completed"]:
+        return None
+    if task["priority"] not in ["High", "Medium", "Low"]:
+        return None
+    if not isinstance(task.get("description", ""), str):
+        task["description"] = ""
+    if not isinstance(task.get("files", []), list):
+        task["files"] = []
+    elif task.get("files"):
+        task["files"] = [entry for entry in task["files"] if isinstance(entry, str) or (
+            isinstance(entry, dict) and isinstance(entry.get("sha256"), str) and isinstance(entry.get("name"), str))]
+    if task.get("recurrence"):
+        try:
+            Recurrence.from_dict(task["recurrence"])
+            int(task.get("occurrence", 0))
+        except (AttributeError, KeyError, TypeError, ValueError):
+            logger.error("Dropping invalid recurrence for task: %s", task)
+            task.pop("recurrence")
+            task.pop("occurrence", None)
+    if "remind" in task:
+        try:
+            parse_offsets(",".join(task["remind"]))
+        except (TypeError, ValueError):
+            logger.error("Dropping invalid reminder offsets for task: %s", task)
+            task.pop("remind")
+    if "depends" in task and (not isinstance(task["depends"], list) or not all(isinstance(task_id, str) for task_id in task["depends"])):
+        logger.error("Dropping invalid dependencies for task: %s", task)
+        task.pop("depends")
+    if not isinstance(task.get("id"), str) or not task["id"] or (seen_ids is not None and task["id"] in seen_ids):
+        task["id"] = uuid.uuid4().hex
+    try:
+        result = Task.from_dict(task)
+    except (TypeError, ValueError):
+        logger.error("Invalid date/time for task: %s", task)
+        return None
+    if seen_ids is not None:
+        seen_ids.add(result.id)
+    return result
+
+def read_task_file(path):
+    extension = os.path.splitext(path)[1].lower()
+    seen_ids = set()
+    tasks = []
+    skipped = 0
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            records = []
+            for row in csv.DictReader(f):
+                for key in ("files", "recurrence", "remind", "depends"):
+                    if row.get(key):
+                        try:
+                            row[key] = json.loads(row[key])
+                        except ValueError:
+                            row[key] = None
+                    else:
+                        row.pop(key, None)
+                if row.get("occurrence"):
+                    row["occurrence"] = int(row["occurrence"]) if row["occurrence"].isdigit() else 0
+                else:
+                    row.pop("occurrence", None)
+                records.append(row)
+        elif extension == ".json":
+            records = iter_json_records(f)
+        else:
+            raise ValueError(f"Unsupported task file type: {extension or path}")
+        for record in records:
+            task = validate_task(record, seen_ids)
+            if task is None:
+                skipped += 1
+            else:
+                tasks.append(task)
+    logger.info("Read %s tasks from %s (%s skipped)", len(tasks), path, skipped)
+    return tasks
+
+def write_task_file(path, tasks):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".csv", ".json"):
+        raise ValueError(f"Unsupported task file type: {extension or path}")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for task in tasks:
+                row = task.to_dict()
+                row["files"] = json.dumps(row["files"]) if row["files"] else ""
+                row["recurrence"] = json.dumps(row["recurrence"]) if "recurrence" in row else ""
+                row["remind"] = json.dumps(row["remind"]) if "remind" in row else ""
+                row["depends"] = json.dumps(row["depends"]) if "depends" in row else ""
+                writer.writerow(row)
+        else:
+            f.write("[\n")
+            f.write(",\n".join(json.dumps(task.to_dict()) for task in tasks))
+            f.write("\n]\n")
+    os.replace(tmp_path, path)
+    logger.info("Exported %s tasks to %s", len(tasks), path)
+    return len(tasks)
+
+class StdoutSink:
+    def send(self, title, message):
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {title}: {message}", flush=True)
+
+class LogSink:
+    def send(self, title, message):
+        logger.info("Notification: %s: %s", title, message)
+
+class WebhookSink:
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, title, message):
+        import urllib.request
+
+        body = json.dumps({"title": title, "message": message, "app_name": "TaskScheduler"}).encode("utf-8")
+        request = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+class PlyerSink:
+    def send(self, title, message):
+        from plyer import notification
+        notification.notify(
+            title=title,
+            message=message,
+            app_name="TaskScheduler",
+            timeout=10
+        )
+
+SINKS = {"stdout": StdoutSink, "log": LogSink, "webhook": WebhookSink, "plyer": PlyerSink}
+
+def make_sink(name, webhook_url=None):
+    if name == "webhook":
+        if not webhook_url:
+            raise ValueError("The webhook sink needs --webhook-url")
+        return WebhookSink(webhook_url)
+    return SINKS[name]()
+
+class WorkerPool:
+    def __init__(self, name, workers, maxsize, deliver):
+        self.name = name
+        self.deliver = deliver
+        self.jobs = queue.Queue(maxsize)
+        self.dropped = metrics.counter(f"taskscheduler_{name}_jobs_dropped_total", f"Jobs dropped because the {name} queue was full")
+        metrics.gauge(f"taskscheduler_{name}_queue_depth", f"Jobs waiting in the {name} queue", self.jobs.qsize)
+        self.workers = workers
+        self.threads = []
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.threads:
+                return
+            self.threads = [threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True) for i in range(self.workers)]
+            for thread in self.threads:
+                thread.start()
+
+    def submit(self, fn, *args, on_done=None, on_error=None, block=True):
+        if not self.threads:
+            self.start()
+        try:
+            self.jobs.put((fn, args, on_done, on_error), block=block)
+            return True
+        except queue.Full:
+            self.dropped.inc()
+            logger.error("%s queue is full, dropping %s", self.name, getattr(fn, '__name__', fn))
+            return False
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                self.jobs.task_done()
+                return
+            fn, args, on_done, on_error = job
+            try:
+                with tracer.span(self.name):
+                    result = fn(*args)
+            except Exception as e:
+                if on_error is not None:
+                    self.deliver(on_error, e)
+                else:
+                    logger.error("%s job %s failed: %s", self.name, getattr(fn, '__name__', fn), e)
+            else:
+                if on_done is not None:
+                    self.deliver(on_done, result)
+            finally:
+                self.jobs.task_done()
+
+    def shutdown(self, timeout=None):
+        with self.lock:
+            threads = self.threads
+        for _ in threads:
+            self.jobs.put(None)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in threads)
+
+class Dispatcher:
+    def __init__(self, deliver, sink):
+        self.sink = sink
+        self.notify_pool = WorkerPool("notify", NOTIFY_WORKERS, NOTIFY_QUEUE_SIZE, deliver)
+        self.io_pool = WorkerPool("io", 1, IO_QUEUE_SIZE, deliver)
+        self.file_pool = WorkerPool("files", 1, IO_QUEUE_SIZE, deliver)
+
+    def notify(self, title, message, on_done=None, on_error=None, fire_time=None):
+        return self.notify_pool.submit(self.send, title, message, fire_time, on_done=on_done, on_error=on_error, block=False)
+
+    def send(self, title, message, fire_time):
+        try:
+            self.sink.send(title, message)
+        except Exception:
+            NOTIFICATIONS_FAILED.inc()
+            raise
+        NOTIFICATIONS_SENT.inc()
+        if fire_time is not None:
+            NOTIFICATION_LAG.observe(max(0.0, time.time() - fire_time))
+
+    def run_io(self, fn, *args, on_done=None, on_error=None):
+        return self.io_pool.submit(fn, *args, on_done=on_done, on_error=on_error)
+
+    def run_file(self, fn, *args, on_done=None, on_error=None):
+        return self.file_pool.submit(fn, *args, on_done=on_done, on_error=on_error)
+
+    def shutdown(self, timeout=None):
+        self.notify_pool.shutdown(timeout)
+        self.file_pool.shutdown(timeout)
+        pending = self.io_pool.jobs.qsize()
+        if pending:
+            logger.info("Waiting for %s queued store write(s) to finish", pending)
+        if not self.io_pool.shutdown(IO_DRAIN_TIMEOUT):
+            logger.critical("Gave up after %.0fs with %s store write(s) still pending, recent changes may be lost", IO_DRAIN_TIMEOUT, self.io_pool.jobs.qsize())
+
+def launch_file(path):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"File not found: {path}")
+    if sys.platform.startswith("win"):
+        os.startfile(path)
+    elif sys.platform == "darwin":
+        subprocess.Popen(["open", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        subprocess.Popen(["xdg-open", path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    logger.info("Opened file: %s", path)
+
+class AttachmentStore:
+    def __init__(self, root, mode=ATTACHMENT_MODE):
+        self.root = root
+        self.objects_path = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.index = None
+
+    def metadata(self, digest):
+        with self.lock:
+            if self.index is None:
+                self.index = self._read_index()
+            return self.index.get(digest)
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.error("Failed to read attachment index %s: %s", self.index_path, e)
+            return {}
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_path, digest[:2], digest[2:])
+
+    def resolve(self, entry):
+        if isinstance(entry, dict):
+            return self.object_path(entry["sha256"])
+        return entry
+
+    def add(self, path):
+        os.makedirs(self.objects_path, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = None
+        if self.mode == "link":
+            with open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    size += len(chunk)
+        else:
+            tmp_path = os.path.join(self.objects_path, f".{uuid.uuid4().hex}.tmp")
+            with open(path, "rb") as source, open(tmp_path, "wb") as target:
+                for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    target.write(chunk)
+        digest = digest.hexdigest()
+        object_path = self.object_path(digest)
+        try:
+            if os.path.exists(object_path):
+                logger.info("Attachment %s already stored as %s", path, digest)
+            else:
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                if tmp_path is not None:
+                    os.replace(tmp_path, object_path)
+                    tmp_path = None
+                else:
+                    try:
+                        os.link(path, object_path)
+                    except OSError:
+                        shutil.copyfile(path, object_path)
+                logger.info("Stored attachment %s as %s (%s bytes)", path, digest, size)
+        finally:
+            if tmp_path is not None:
+                os.remove(tmp_path)
+        name = os.path.basename(path)
+        metadata = {"size": size, "mime": mimetypes.guess_type(name)[0] or "application/octet-stream"}
+        with self.lock:
+            if self.index is None:
+                self.index = self._read_index()
+            if self.index.get(digest) != metadata:
+                self.index[digest] = metadata
+                self._write_index()
+        return {"name": name, "sha256": digest}
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def describe(self, entry):
+        if not isinstance(entry, dict):
+            return os.path.basename(entry)
+        metadata = self.metadata(entry["sha256"])
+        if metadata is None:
+            return entry["name"]
+        size = metadata["size"]
+        for unit in ("B", "KB", "MB", "GB"):
+            if size < 1024 or unit == "GB":
+                break
+            size /= 1024
+        size_text = f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        return f"{entry['name']} ({size_text}, {metadata['mime']})"
+
+class IndexedHeap:
+    def __init__(self):
+        self.heap = []
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def push(self, key, sort_key, payload=None):
+        self.remove(key)
+        entry = [sort_key, next(self.counter), key, payload, True]
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+        return self.heap[0] is entry
+
+    def remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        entry[-1] = False
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.entries):
+            self.heap = [entry for entry in self.heap if entry[-1]]
+            heapq.heapify(self.heap)
+        return True
+
+    def peek(self):
+        while self.heap and not self.heap[0][-1]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+        sort_key, _, key, payload, _ = self.heap[0]
+        return sort_key, key, payload
+
+    def pop(self):
+        head = self.peek()
+        if head is not None:
+            heapq.heappop(self.heap)
+            del self.entries[head[1]]
+        return head
+
+    def smallest(self, n):
+        entries = heapq.nsmallest(n, (entry for entry in self.heap if entry[-1]))
+        return [(sort_key, key, payload) for sort_key, _, key, payload, _ in entries]
+
+    def clear(self):
+        self.heap = []
+        self.entries = {}
+
+class DependencyGraph:
+    def __init__(self):
+        self.prerequisites = {}
+        self.dependents = {}
+        self.waiting = {}
+        self.open = set()
+
+    def __len__(self):
+        return len(self.prerequisites)
+
+    def blocked(self, task_id):
+        return task_id in self.waiting
+
+    def blockers(self, task_id):
+        return [dep for dep in self.prerequisites.get(task_id, ()) if dep in self.open]
+
+    def creates_cycle(self, task_id, depends):
+        stack = list(depends)
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current == task_id:
+                return True
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(self.prerequisites.get(current, ()))
+        return False
+
+    def update(self, task):
+        old = self.prerequisites.get(task.id, ())
+        if old != task.depends:
+            for dep in old:
+                dependents = self.dependents[dep]
+                dependents.discard(task.id)
+                if not dependents:
+                    del self.dependents[dep]
+            for dep in task.depends:
+                self.dependents.setdefault(dep, set()).add(task.id)
+            if task.depends:
+                self.prerequisites[task.id] = task.depends
+            else:
+                self.prerequisites.pop(task.id, None)
+            self._set_waiting(task.id, sum(1 for dep in task.depends if dep in self.open))
+        return self._set_open(task.id, task.status != "Completed")
+
+    def remove(self, task_id):
+        flipped = self._set_open(task_id, False)
+        for dep in self.prerequisites.pop(task_id, ()):
+            dependents = self.dependents.get(dep)
+            if dependents is not None:
+                dependents.discard(task_id)
+                if not dependents:
+                    del self.dependents[dep]
+        self.waiting.pop(task_id, None)
+        return flipped
+
+    def _set_open(self, task_id, is_open):
+        if (task_id in self.open) == is_open:
+            return []
+        if is_open:
+            self.open.add(task_id)
+        else:
+            self.open.discard(task_id)
+        delta = 1 if is_open else -1
+        flipped = []
+        for dependent in self.dependents.get(task_id, ()):
+            before = self.waiting.get(dependent, 0)
+            self._set_waiting(dependent, before + delta)
+            if (before == 0) != (before + delta == 0):
+                flipped.append(dependent)
+        return flipped
+
+    def _set_waiting(self, task_id, count):
+        if count > 0:
+            self.waiting[task_id] = count
+        else:
+            self.waiting.pop(task_id, None)
+
+class ReminderScheduler:
+    def __init__(self, callback):
+        self.callback = callback
+        self.queue = IndexedHeap()
+        self.condition = threading.Condition()
+        self.running = True
+
+    def __len__(self):
+        with self.condition:
+            return len(self.queue)
+
+    def schedule(self, key, fire_time, payload):
+        with self.condition:
+            if self.queue.push(key, fire_time, payload):
+                self.condition.notify()
+
+    def cancel(self, key):
+        with self.condition:
+            head = self.queue.peek()
+            if self.queue.remove(key) and head[1] == key:
+                self.condition.notify()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def next_fire_time(self):
+        with self.condition:
+            head = self.queue.peek()
+            return head[0] if head else None
+
+    def run(self):
+        while True:
+            fired = []
+            with self.condition:
+                while self.running:
+                    head = self.queue.peek()
+                    if head is None:
+                        self.condition.wait()
+                        continue
+                    delay = head[0] - time.time()
+                    if delay > 0:
+                        self.condition.wait(delay)
+                        continue
+                    now = time.time()
+                    while head is not None and head[0] <= now:
+                        fired.append(self.queue.pop())
+                        head = self.queue.peek()
+                    break
+                if not self.running:
+                    return
+            for fire_time, key, payload in fired:
+                try:
+                    with tracer.span("reminder"):
+                        self.callback(key, payload, fire_time)
+                except Exception as e:
+                    logger.error("Reminder callback failed for %s: %s", key, e)
+
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.depth = 0
+        self.lock = threading.RLock()
+
+    @contextlib.contextmanager
+    def hold(self):
+        with self.lock:
+            if self.depth == 0:
+                self._acquire()
+            self.depth += 1
+            try:
+                yield
+            finally:
+                self.depth -= 1
+                if self.depth == 0:
+                    self._release()
+
+    def _acquire(self):
+        if self.file is None:
+            self.file = open(self.path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            return
+        self.file.seek(0)
+        while True:
+            try:
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _release(self):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+class LeaderLease:
+    def __init__(self, path, owner, seconds=LEASE_SECONDS):
+        self.path = path
+        self.lock = FileLock(path + ".lock")
+        self.owner = owner
+        self.seconds = seconds
+        self.expires = 0.0
+        self.leader = False
+
+    def renew(self):
+        now = time.time()
+        if self.leader and self.expires - now > self.seconds / 2:
+            return True
+        with self.lock.hold():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    current = json.load(f)
+            except (OSError, ValueError):
+                current = {}
+            if not isinstance(current, dict):
+                current = {}
+            leader = current.get("owner") == self.owner or not isinstance(current.get("expires"), (int, float)) or current["expires"] < now
+            if leader:
+                self.expires = now + self.seconds
+                self._write({"owner": self.owner, "pid": os.getpid(), "expires": self.expires})
+        if leader != self.leader:
+            if leader:
+                logger.info("This process now dispatches reminders (lease %s)", self.path)
+            else:
+                logger.info("Reminders are dispatched by process %s, this one stays quiet", current.get("pid"))
+        self.leader = leader
+        return leader
+
+    def release(self):
+        if self.leader:
+            with self.lock.hold():
+                self._write({"owner": None, "pid": None, "expires": 0})
+            self.leader = False
+        self.lock.close()
+
+    def _write(self, data):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+class JournalStore:
+    def __init__(self, snapshot_path, journal_path):
+        self.path = snapshot_path
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.compacting_path = journal_path + ".compacting"
+        self.file_lock = FileLock(snapshot_path + ".lock")
+        self.writer = uuid.uuid4().hex[:12]
+        self.records = {}
+        self.missed = []
+        self.offset = 0
+        self.journal_stamp = None
+        self.snapshot_stamp = None
+        self.fsync_pending = False
+        self.appended = 0
+        self.load_progress = 0.0
+        self.dirty = False
+        self.running = True
+        self.compaction_thread = None
+        self.condition = threading.Condition()
+        self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flush_thread.start()
+
+    def load(self):
+        tasks = {}
+        for op, payload in self.iter_records():
+            if op == "delete":
+                tasks.pop(payload, None)
+                continue
+            key = payload.get("id") if isinstance(payload, dict) else None
+            if not isinstance(key, str) or op == "snapshot" and key in tasks:
+                key = object()
+            tasks.pop(key, None)
+            tasks[key] = payload
+        return list(tasks.values())
+
+    def iter_records(self):
+        with self.file_lock.hold():
+            self._trim_journal()
+        yield from self._read_all()
+
+    def _trim_journal(self):
+        try:
+            f = open(self.journal_path, "rb+")
+        except FileNotFoundError:
+            return
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                chunk = f.read(end - start)
+                if start + len(chunk) == size and chunk.endswith(b"\n"):
+                    return
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            logger.warning("Truncating %s byte(s) of a torn record at the end of %s", size - end, self.journal_path)
+            f.truncate(end)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_all(self):
+        self.appended = 0
+        self.load_progress = 0.0
+        self.snapshot_stamp = file_stamp(self.snapshot_path)
+        self.journal_stamp = None
+        self.offset = 0
+        if os.path.exists(self.snapshot_path):
+            size = max(1, os.path.getsize(self.snapshot_path))
+            consumed = 0
+
+            def on_read(count):
+                nonlocal consumed
+                consumed += count
+                self.load_progress = min(1.0, consumed / size)
+
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                for task in iter_json_records(f, on_read):
+                    yield "snapshot", task
+        yield from self._replay(self.compacting_path)
+        try:
+            journal = open(self.journal_path, "rb")
+        except FileNotFoundError:
+            journal = None
+        if journal is not None:
+            with journal:
+                st = os.fstat(journal.fileno())
+                self.journal_stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+                for op, payload, _, end in self._parse_journal(journal, self.journal_path, 0):
+                    self.appended += 1
+                    self.offset = end
+                    yield op, payload
+        self.load_progress = 1.0
+        logger.info("Loaded %s after replaying %s journal record(s)", self.snapshot_path, self.appended)
+
+    def _replay(self, path):
+        for op, payload, _, _ in self._read_journal(path, 0):
+            self.appended += 1
+            yield op, payload
+
+    def _read_journal(self, path, offset):
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            yield from self._parse_journal(f, path, offset)
+
+    def _parse_journal(self, f, path, offset):
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if record["op"] == "put" and isinstance(record["task"].get("id"), str):
+                    op, payload = "put", record["task"]
+                elif record["op"] == "delete":
+                    op, payload = "delete", record["id"]
+                else:
+                    raise ValueError(f"Unknown journal record: {record}")
+            except (AttributeError, KeyError, TypeError, ValueError):
+                logger.error("Skipping corrupt journal record at %s (byte %s)", path, offset - len(line))
+                continue
+            yield op, payload, record.get("src"), offset
+
+    def changed_on_disk(self):
+        journal = file_stamp(self.journal_path)
+        if file_stamp(self.snapshot_path) != self.snapshot_stamp or (journal is None) != (self.journal_stamp is None):
+            return True
+        return journal is not None and (journal[0] != self.journal_stamp[0] or journal[2] != self.offset)
+
+    def poll(self):
+        if not self.missed and not self.changed_on_disk():
+            return []
+        with self.file_lock.hold(), self.condition:
+            self._sync()
+            changes, self.missed = self.missed, []
+        return changes
+
+    def _sync(self):
+        journal = file_stamp(self.journal_path)
+        if self.journal_stamp is None and journal is not None and self.offset == 0:
+            self.journal_stamp = journal
+        if file_stamp(self.snapshot_path) != self.snapshot_stamp or journal is None and self.journal_stamp is not None or journal is not None and (journal[0] != self.journal_stamp[0] or journal[2] < self.offset):
+            self._reload()
+            return
+        for op, payload, writer, end in self._read_journal(self.journal_path, self.offset):
+            self.offset = end
+            if writer != self.writer:
+                self._merge(op, payload)
+
+    def _merge(self, op, payload):
+        if op == "delete":
+            if self.records.pop(payload, None) is not None:
+                self.missed.append(("delete", payload))
+            return
+        task = validate_task(payload)
+        if task is not None:
+            self.records[task.id] = task
+            self.missed.append(("put", task))
+
+    def _reload(self):
+        current = {}
+        for op, payload in self._read_all():
+            if op == "delete":
+                current.pop(payload, None)
+            elif isinstance(payload, dict) and isinstance(payload.get("id"), str):
+                current[payload["id"]] = payload
+        for task_id in [task_id for task_id in self.records if task_id not in current]:
+            self._merge("delete", task_id)
+        merged = 0
+        for task_id, payload in current.items():
+            known = self.records.get(task_id)
+            if known is None or known.to_dict() != payload:
+                self._merge("put", payload)
+                merged += 1
+        logger.info("Reloaded %s, %s task(s) changed by another process", self.snapshot_path, merged)
+
+    def reset(self, tasks, compact=False):
+        with self.condition:
+            self.records = {task.id: task for task in tasks}
+        if compact:
+            self.compact()
+
+    def put(self, task):
+        self._append([({"op": "put", "task": task.to_dict()}, task.id, task)])
+
+    def delete(self, task_id):
+        self._append([({"op": "delete", "id": task_id}, task_id, None)])
+
+    def write_batch(self, puts=(), deletes=()):
+        entries = [({"op": "put", "task": task.to_dict()}, task.id, task) for task in puts]
+        entries.extend(({"op": "delete", "id": task_id}, task_id, None) for task_id in deletes)
+        if entries:
+            self._append(entries)
+
+    def _append(self, entries):
+        for record, _, _ in entries:
+            record["src"] = self.writer
+        data = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record, _, _ in entries).encode("utf-8")
+        with tracer.span("journal.append"), self.file_lock.hold(), self.condition:
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+            if self.journal_stamp is None:
+                self.journal_stamp = file_stamp(self.journal_path)
+            self.fsync_pending = True
+            for _, task_id, value in entries:
+                if value is None:
+                    self.records.pop(task_id, None)
+                else:
+                    self.records[task_id] = value
+            self.appended += len(entries)
+            if not self.dirty:
+                self.dirty = True
+                self.condition.notify_all()
+            should_compact = self.appended >= max(COMPACT_THRESHOLD, len(self.records))
+        if should_compact:
+            self.compact()
+
+    def _flush_loop(self):
+        while True:
+            with self.condition:
+                while self.running and not self.dirty:
+                    self.condition.wait()
+                if not self.dirty:
+                    return
+                self.condition.wait(FSYNC_INTERVAL)
+                self.dirty = False
+            self.sync_journal()
+
+    def sync_journal(self):
+        with self.file_lock.hold():
+            if not self.fsync_pending or not os.path.exists(self.journal_path):
+                return
+            self.fsync_pending = False
+            try:
+                start = time.perf_counter()
+                with tracer.span("journal.fsync"), open(self.journal_path, "ab") as f:
+                    os.fsync(f.fileno())
+                FSYNC_SECONDS.observe(time.perf_counter() - start)
+            except OSError as e:
+                logger.error("Failed to fsync %s: %s", self.journal_path, e)
+
+    def compact(self, wait=False, force=True):
+        with self.file_lock.hold(), self.condition:
+            if not force and self.appended == 0 and not os.path.exists(self.compacting_path):
+                return
+            if self.compaction_thread is not None and self.compaction_thread.is_alive():
+                thread = self.compaction_thread
+            else:
+                self._sync()
+                self.fsync_pending = True
+                self.sync_journal()
+                if os.path.exists(self.journal_path) and not os.path.exists(self.compacting_path):
+                    os.replace(self.journal_path, self.compacting_path)
+                    self.journal_stamp = None
+                    self.offset = 0
+                self.appended = 0
+                snapshot = list(self.records.values())
+                thread = threading.Thread(target=self._write_snapshot, args=(snapshot,), daemon=True)
+                self.compaction_thread = thread
+                thread.start()
+        if wait:
+            thread.join()
+
+    def _write_snapshot(self, snapshot):
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            start = time.perf_counter()
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("[\n")
+                f.write(",\n".join(json.dumps(task.to_dict()) for task in snapshot))
+                f.write("\n]\n")
+                f.flush()
+                os.fsync(f.fileno())
+            with self.file_lock.hold():
+                os.replace(tmp_path, self.snapshot_path)
+                if os.path.exists(self.compacting_path):
+                    os.remove(self.compacting_path)
+                self.snapshot_stamp = file_stamp(self.snapshot_path)
+            COMPACTION_SECONDS.observe(time.perf_counter() - start)
+            logger.info("Compacted %s tasks into %s in %.3fs", len(snapshot), self.snapshot_path, time.perf_counter() - start)
+        except Exception as e:
+            logger.error("Failed to compact tasks: %s", e)
+
+    def close(self, compact=True):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.flush_thread.join()
+        if compact:
+            self.compact(wait=True, force=False)
+        self.file_lock.close()
+
+class SqliteTaskStore:
+    def __init__(self, db_path):
+        self.path = db_path
+        self.load_progress = 0.0
+        self.lock = threading.Lock()
+        self.file_lock = FileLock(db_path + ".lock")
+        self.versions = {}
+        self.data_version = None
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                due_date TEXT NOT NULL,
+                due_time TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_priority_due ON tasks (status, priority, due_date, due_time);
+            CREATE INDEX IF NOT EXISTS idx_tasks_status_due ON tasks (status, due_date, due_time);
+        """)
+        self.conn.commit()
+
+    def _row(self, task):
+        return (task.id, task.name, task.status, task.priority, task.due_date, task.due_time, json.dumps(task.to_dict()))
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def import_json(self, snapshot_path, journal_path):
+        source = JournalStore(snapshot_path, journal_path)
+        tasks = source.load()
+        source.close(compact=False)
+        seen_ids = set()
+        rows = []
+        for payload in tasks:
+            task = validate_task(payload, seen_ids)
+            if task is None:
+                logger.error("Skipping invalid task during import: %s", payload)
+                continue
+            rows.append(self._row(task))
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        logger.info("Imported %s tasks from %s into %s", len(rows), snapshot_path, self.path)
+        return len(rows)
+
+    def load(self):
+        return [payload for _, payload in self.iter_records()]
+
+    def iter_records(self):
+        total = max(1, self.count())
+        loaded = 0
+        with self.lock:
+            self.data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            cursor = self.conn.execute("SELECT id, data FROM tasks ORDER BY priority, due_date, due_time")
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for task_id, data in rows:
+                self.versions[task_id] = hash(data)
+                yield "snapshot", json.loads(data)
+            loaded += len(rows)
+            self.load_progress = min(1.0, loaded / total)
+        self.load_progress = 1.0
+
+    def reset(self, tasks, compact=False):
+        if not compact:
+            return
+        rows = {}
+        for task in tasks:
+            row = self._row(task)
+            if self.versions.get(task.id) != hash(row[-1]):
+                rows[task.id] = row
+        live = {task.id for task in tasks}
+        with self.file_lock.hold(), self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            dropped = [task_id for task_id in self.versions if task_id not in live]
+            current = self._fetch_data(list(rows) + dropped)
+            writes = [row for task_id, row in rows.items() if self._unchanged(task_id, current)]
+            deletes = [task_id for task_id in dropped if task_id in current and self._unchanged(task_id, current)]
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", writes)
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deletes])
+            self.versions.update((row[0], hash(row[-1])) for row in writes)
+            for task_id in deletes:
+                del self.versions[task_id]
+        skipped = len(rows) + len(dropped) - len(writes) - len(deletes)
+        logger.info("Rewrote %s and removed %s task row(s) in %s, skipped %s changed by another process", len(writes), len(deletes), self.path, skipped)
+
+    def _fetch_data(self, task_ids):
+        current = {}
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            current.update(self.conn.execute(f"SELECT id, data FROM tasks WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return current
+
+    def _unchanged(self, task_id, current):
+        data = current.get(task_id)
+        return (None if data is None else hash(data)) == self.versions.get(task_id)
+
+    def put(self, task):
+        row = self._row(task)
+        with tracer.span("sqlite.put"), self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+            self.versions[task.id] = hash(row[-1])
+
+    def delete(self, task_id):
+        with tracer.span("sqlite.delete"), self.lock, self.conn:
+            self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            self.versions.pop(task_id, None)
+
+    def write_batch(self, puts=(), deletes=()):
+        rows = [self._row(task) for task in puts]
+        with tracer.span("sqlite.batch"), self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deletes])
+            self.versions.update((row[0], hash(row[-1])) for row in rows)
+            for task_id in deletes:
+                self.versions.pop(task_id, None)
+
+    def poll(self):
+        with self.lock:
+            data_version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self.data_version:
+                return []
+            self.data_version = data_version
+            rows = self.conn.execute("SELECT id, data FROM tasks").fetchall()
+            current = {task_id: data for task_id, data in rows}
+            changes = [("delete", task_id) for task_id in self.versions if task_id not in current]
+            for _, task_id in changes:
+                del self.versions[task_id]
+            for task_id, data in current.items():
+                version = hash(data)
+                if self.versions.get(task_id) != version:
+                    self.versions[task_id] = version
+                    task = validate_task(json.loads(data))
+                    if task is not None:
+                        changes.append(("put", task))
+        return changes
 
-logging.basicConfig(filename=DEBUG_LOG, level=logging.DEBUG, format="%(asctime)s - %(message)s")
+    def next_pending(self, limit):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM tasks WHERE status = 'Pending' ORDER BY priority, due_date, due_time LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def due_between(self, start, end):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM tasks WHERE status = 'Pending' AND (due_date, due_time) >= (?, ?) AND (due_date, due_time) < (?, ?) ORDER BY due_date, due_time",
+                (start.strftime("%Y-%m-%d"), start.strftime("%H:%M"), end.strftime("%Y-%m-%d"), end.strftime("%H:%M"))
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def due_within(self, seconds):
+        now = datetime.now()
+        return self.due_between(now, now + timedelta(seconds=seconds))
+
+    def compact(self, wait=False, force=True):
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self.lock:
+            self.conn.execute("PRAGMA optimize")
+            self.conn.close()
+        self.file_lock.close()
+
+def open_task_store(mode=STORAGE_MODE):
+    if mode == "sqlite":
+        store = SqliteTaskStore(DB_FILE)
+        if store.count() == 0 and (os.path.exists(TASKS_FILE) or os.path.exists(JOURNAL_FILE)):
+            store.import_json(TASKS_FILE, JOURNAL_FILE)
+        return store
+    return JournalStore(TASKS_FILE, JOURNAL_FILE)
+
+class SchedulerEngine:
+    def __init__(self, store, sink, deliver=None, on_error=None, attachments=None):
+        self.store = store
+        self.sink = sink
+        self.attachments = attachments if attachments is not None else AttachmentStore(ATTACHMENTS_DIR)
+        self.tasks = {}
+        self.task_queue = IndexedHeap()
+        self.graph = DependencyGraph()
+        self.listeners = []
+        self.deliver = deliver or (lambda callback, *args: callback(*args))
+        self.on_error = on_error
+        self.reminders = ReminderScheduler(self.on_timer)
+        self.dispatcher = Dispatcher(self.deliver, sink)
+        self.notification_thread = None
+        self.timer_keys = {}
+        self.pending_reminders = {}
+        self.reminded = {}
+        self.reminder_lock = threading.Lock()
+        self.last_notification = 0.0
+        self.unsaved = {}
+        self.lease = LeaderLease(store.path + ".lease", uuid.uuid4().hex)
+        metrics.gauge("taskscheduler_tasks", "Tasks in memory", lambda: len(self.tasks))
+        metrics.gauge("taskscheduler_pending_tasks", "Pending tasks in the priority queue", lambda: len(self.task_queue))
+        metrics.gauge("taskscheduler_blocked_tasks", "Pending tasks waiting on unfinished prerequisites", lambda: len(self.graph.waiting))
+        metrics.gauge("taskscheduler_reminders_scheduled", "Reminder and occurrence timers waiting to fire", lambda: len(self.reminders))
+        metrics.gauge("taskscheduler_next_reminder_seconds", "Seconds until the next timer fires", self.seconds_to_next_timer)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def notify_listeners(self, changed=(), removed=()):
+        for listener in self.listeners:
+            listener(changed, removed)
+
+    def report_error(self, title, message):
+        if self.on_error is not None:
+            self.on_error(title, message)
+
+    def read_tasks(self, emit):
+        try:
+            batch = []
+            batch_size = 100
+            seen_ids = set()
+            changed = False
+            for op, payload in self.store.iter_records():
+                if op == "delete":
+                    batch.append((op, payload))
+                else:
+                    original_id = payload.get("id") if isinstance(payload, dict) else None
+                    task = validate_task(payload, seen_ids if op == "snapshot" else None)
+                    if task is None:
+                        changed = True
+                        continue
+                    if task.id != original_id:
+                        changed = True
+                    batch.append(("put", task))
+                if len(batch) >= batch_size:
+                    emit("batch", batch, self.store.load_progress)
+                    batch = []
+                    batch_size = min(batch_size * 2, 10000)
+            emit("batch", batch, 1.0)
+            emit("done", changed, None)
+        except json.JSONDecodeError:
+            logger.error("Failed to load tasks: Invalid JSON format")
+            emit("error", "Failed to load tasks: Invalid JSON format", None)
+        except Exception as e:
+            logger.error("Failed to load tasks: %s", e)
+            emit("error", f"Failed to load tasks: {str(e)}", None)
+
+    def apply_records(self, records):
+        with tracer.span("apply_records"):
+            self._apply_records(records)
+
+    def _apply_records(self, records):
+        touched = {}
+        for op, item in records:
+            if op == "put":
+                self.tasks[item.id] = item
+                if self.catch_up(item):
+                    self.persist_task(item)
+                touched.update(self.requeue_dependents(self.graph.update(item)))
+                self.queue_task(item)
+                self.schedule_reminder(item)
+                touched[item.id] = item
+            elif item in self.tasks:
+                self.tasks.pop(item)
+                self.task_queue.remove(item)
+                self.cancel_timers(item, forget=True)
+                touched.update(self.requeue_dependents(self.graph.remove(item)))
+                touched[item] = None
+        if touched:
+            self.notify_listeners(
+                changed=[task for task in touched.values() if task is not None],
+                removed=list(touched)
+            )
+
+    def finish_loading(self, changed):
+        self.store.reset(list(self.tasks.values()), compact=changed)
+        logger.info("Loaded %s valid tasks from %s", len(self.tasks), self.store.path)
+
+    def load(self):
+        errors = []
+
+        def emit(kind, payload, extra):
+            if kind == "batch":
+                self.apply_records(payload)
+            elif kind == "done":
+                self.finish_loading(payload)
+            else:
+                errors.append(payload)
+        self.read_tasks(emit)
+        for message in errors:
+            self.report_error("Error", message)
+        return not errors
+
+    def start(self):
+        try:
+            self.lease.renew()
+        except OSError as e:
+            logger.error("Failed to take the reminder lease: %s", e)
+        self.reminders.schedule(("sync",), time.time() + SYNC_INTERVAL, ("sync", None))
+        self.notification_thread = threading.Thread(target=self.check_notifications, daemon=True)
+        self.notification_thread.start()
+
+    def stop(self):
+        self.reminders.stop()
+        if self.notification_thread:
+            self.notification_thread.join(timeout=1.0)
+        self.dispatcher.shutdown(timeout=5.0)
+        try:
+            self.lease.release()
+        except OSError as e:
+            logger.error("Failed to release the reminder lease: %s", e)
+        try:
+            self.store.close()
+        except Exception as e:
+            logger.error("Failed to close task store: %s", e)
+        if tracer.enabled:
+            tracer.report()
+
+    def seconds_to_next_timer(self):
+        fire_time = self.reminders.next_fire_time()
+        return float("nan") if fire_time is None else fire_time - time.time()
+
+    def write_store(self, write, *args):
+        start = time.perf_counter()
+        try:
+            write(*args)
+        except Exception:
+            STORE_ERRORS.inc()
+            raise
+        STORE_WRITE_SECONDS.observe(time.perf_counter() - start)
+
+    def track_unsaved(self, task_ids, delta):
+        for task_id in task_ids:
+            count = self.unsaved.get(task_id, 0) + delta
+            if count > 0:
+                self.unsaved[task_id] = count
+            else:
+                self.unsaved.pop(task_id, None)
+
+    def persist_task(self, task):
+        def on_error(e):
+            self.track_unsaved([task.id], -1)
+            logger.error("Failed to save task %s: %s", task.name, e)
+            self.report_error("Error", f"Failed to save task: {str(e)}")
+        self.track_unsaved([task.id], 1)
+        self.dispatcher.run_io(self.write_store, self.store.put, task, on_done=lambda _: self.track_unsaved([task.id], -1), on_error=on_error)
+
+    def persist_batch(self, puts, deletes):
+        task_ids = [task.id for task in puts] + list(deletes)
+
+        def on_error(e):
+            self.track_unsaved(task_ids, -1)
+            logger.error("Failed to save %s task change(s): %s", len(puts) + len(deletes), e)
+            self.report_error("Error", f"Failed to save tasks: {str(e)}")
+        self.track_unsaved(task_ids, 1)
+        self.dispatcher.run_io(self.write_store, self.store.write_batch, puts, deletes, on_done=lambda _: self.track_unsaved(task_ids, -1), on_error=on_error)
+
+    def sync_store(self):
+        try:
+            self.lease.renew()
+        except OSError as e:
+            logger.error("Failed to renew the reminder lease: %s", e)
+        return self.store.poll()
+
+    def apply_remote_changes(self, changes):
+        self.reminders.schedule(("sync",), time.time() + SYNC_INTERVAL, ("sync", None))
+        changes = [(op, item) for op, item in changes if (item.id if op == "put" else item) not in self.unsaved]
+        if changes:
+            logger.info("Merged %s change(s) made by another process", len(changes))
+            self.apply_records(changes)
+
+    def sync_failed(self, e):
+        self.reminders.schedule(("sync",), time.time() + SYNC_INTERVAL, ("sync", None))
+        logger.error("Failed to check the task store for changes: %s", e)
+
+    def completion_line(self, task, log_time):
+        return f"[{log_time}] Completed: {task.name} (Due: {task.due_date} {task.due_time}, Priority: {task.priority_name})\n"
+
+    def log_completions(self, lines):
+        def write():
+            with open(LOG_FILE, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+            logger.info("Logged %s completed task(s)", len(lines))
+
+        def on_error(e):
+            logger.error("Failed to log task: %s", e)
+            self.report_error("Error", f"Failed to log task: {str(e)}")
+        self.dispatcher.run_io(write, on_error=on_error)
+
+    def queue_task(self, task):
+        if task.status != "Pending" or self.graph.blocked(task.id):
+            self.task_queue.remove(task.id)
+            return
+        self.task_queue.push(task.id, (task.priority, task.due))
+
+    def next_ready(self, n):
+        return [self.tasks[task_id] for _, task_id, _ in self.task_queue.smallest(n)]
+
+    def requeue_dependents(self, task_ids):
+        requeued = {}
+        for task_id in task_ids:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                self.queue_task(task)
+                self.schedule_reminder(task)
+                requeued[task_id] = task
+        return requeued
+
+    def status_label(self, task):
+        return "Blocked" if task.status == "Pending" and self.graph.blocked(task.id) else task.status
+
+    def check_dependencies(self, task):
+        missing = [dep for dep in task.depends if dep not in self.tasks]
+        if missing:
+            logger.warning("Task %s depends on unknown task(s): %s", task.name, ", ".join(missing))
+        if self.graph.creates_cycle(task.id, task.depends):
+            raise ValueError(f"Task '{task.name}' would depend on itself through its prerequisites")
+
+    def apply_batch(self, puts=(), completions=(), deletions=(), persist=True):
+        with tracer.span("apply_batch"):
+            changed = {}
+            requeued = {}
+            removed = []
+            added = updated = 0
+            completed_lines = []
+            log_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for task in puts:
+                try:
+                    self.check_dependencies(task)
+                except ValueError as e:
+                    logger.error("Rejected task %s: %s", task.name, e)
+                    self.report_error("Dependency Error", str(e))
+                    continue
+                if task.id in self.tasks:
+                    self.cancel_timers(task.id)
+                    updated += 1
+                else:
+                    added += 1
+                self.tasks[task.id] = task
+                self.catch_up(task)
+                requeued.update(self.requeue_dependents(self.graph.update(task)))
+                self.queue_task(task)
+                self.schedule_reminder(task)
+                changed[task.id] = task
+            for task_id in completions:
+                task = self.tasks.get(task_id)
+                if task is None or task.status == "Completed":
+                    continue
+                completed_lines.append(self.completion_line(task, log_time))
+                self.cancel_timers(task.id)
+                if not task.advance(time.time()):
+                    task.status = "Completed"
+                    requeued.update(self.requeue_dependents(self.graph.update(task)))
+                self.queue_task(task)
+                self.schedule_reminder(task)
+                changed[task.id] = task
+            for task_id in deletions:
+                task = self.tasks.pop(task_id, None)
+                if task is None:
+                    continue
+                self.task_queue.remove(task_id)
+                self.cancel_timers(task_id, forget=True)
+                requeued.update(self.requeue_dependents(self.graph.remove(task_id)))
+                changed.pop(task_id, None)
+                removed.append(task_id)
+            saved = list(changed.values())
+            for task_id in removed:
+                requeued.pop(task_id, None)
+            if completed_lines:
+                self.log_completions(completed_lines)
+            if persist and (saved or removed):
+                self.persist_batch(saved, removed)
+            if saved or removed or requeued:
+                self.notify_listeners(changed=saved + [task for task_id, task in requeued.items() if task_id not in changed], removed=removed)
+        TASKS_ADDED.inc(added)
+        TASKS_COMPLETED.inc(len(completed_lines))
+        TASKS_DELETED.inc(len(removed))
+        if added + updated + len(completed_lines) + len(removed) > 1:
+            logger.info("Applied batch: %s added, %s updated, %s completed, %s deleted", added, updated, len(completed_lines), len(removed))
+        if requeued and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Dependency changes requeued %s task(s)", len(requeued))
+        return saved, removed
+
+    def add_tasks(self, tasks):
+        return self.apply_batch(puts=tasks)
+
+    def complete_tasks(self, task_ids):
+        return self.apply_batch(completions=task_ids)
+
+    def delete_tasks(self, task_ids):
+        return self.apply_batch(deletions=task_ids)
+
+    def add_task(self, task):
+        saved, _ = self.apply_batch(puts=[task])
+        if not saved:
+            return False
+        logger.info("Added task: %s, Due: %s %s", task.name, task.due_date, task.due_time)
+        return True
+
+    def complete_task(self, task_id):
+        task = self.tasks[task_id]
+        if task.status == "Completed":
+            return False
+        self.apply_batch(completions=[task_id])
+        if task.status == "Pending":
+            logger.info("Task %s completed occurrence, next due %s %s", task.name, task.due_date, task.due_time)
+        else:
+            logger.info("Completed task: %s", task.name)
+        return True
+
+    def delete_task(self, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        self.apply_batch(deletions=[task_id])
+        logger.info("Deleted task: %s", task.name)
+        return True
+
+    def attach_files(self, task_id, paths):
+        def ingest():
+            entries = []
+            for path in paths:
+                try:
+                    entries.append(self.attachments.add(path))
+                except OSError as e:
+                    logger.error("Failed to attach %s: %s", path, e)
+                    self.deliver(self.report_error, "Error", f"Failed to attach {os.path.basename(path)}: {str(e)}")
+            return entries
+
+        def attached(entries):
+            task = self.tasks.get(task_id)
+            if task is None or not entries:
+                return
+            task.files = task.files + entries
+            self.apply_batch(puts=[task])
+            logger.info("Attached %s file(s) to task: %s", len(entries), task.name)
+        self.dispatcher.run_file(ingest, on_done=attached)
+
+    def open_attachment(self, entry):
+        def on_error(e):
+            logger.error("Failed to open file: %s", e)
+            self.report_error("Error", f"Failed to open file: {str(e)}")
+        self.dispatcher.run_file(launch_file, self.attachments.resolve(entry), on_error=on_error)
+
+    def import_file(self, path, on_done=None):
+        def imported(tasks):
+            self.apply_batch(puts=tasks)
+            if on_done is not None:
+                on_done(len(tasks))
+
+        def on_error(e):
+            logger.error("Failed to import tasks from %s: %s", path, e)
+            self.report_error("Import Error", f"Failed to import tasks: {str(e)}")
+        self.dispatcher.run_io(read_task_file, path, on_done=imported, on_error=on_error)
+
+    def export_file(self, path, on_done=None):
+        def on_error(e):
+            logger.error("Failed to export tasks to %s: %s", path, e)
+            self.report_error("Export Error", f"Failed to export tasks: {str(e)}")
+        tasks = sorted(self.tasks.values(), key=lambda task: (task.priority, task.due, task.id))
+        self.dispatcher.run_io(write_task_file, path, tasks, on_done=on_done, on_error=on_error)
+
+    def catch_up(self, task):
+        if task.recurrence is None or task.status != "Pending" or task.due > time.time():
+            return False
+        return task.advance(time.time())
+
+    def schedule_reminder(self, task):
+        self.cancel_timers(task.id)
+        now = time.time()
+        if task.status != "Pending" or task.due <= now:
+            with self.reminder_lock:
+                self.reminded.pop(task.id, None)
+            if task.status == "Pending" and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Task %s is past due, no reminder scheduled", task.name)
+            return
+        with self.reminder_lock:
+            stages = self.reminded.get(task.id)
+            fired = set(stages[1]) if stages is not None and stages[0] == task.due else set()
+        offsets = () if self.graph.blocked(task.id) else task.reminder_offsets
+        keys = []
+        for offset in offsets:
+            if task.due - offset > now and offset not in fired:
+                keys.append(((task.id, "remind", offset), task.due - offset))
+        passed = [offset for offset in offsets if task.due - offset <= now]
+        if passed and min(passed) not in fired:
+            keys.append(((task.id, "remind", min(passed)), now))
+        for key, fire_time in keys:
+            self.reminders.schedule(key, fire_time, ("remind", task))
+        keys = [key for key, _ in keys]
+        if task.recurrence is not None:
+            self.reminders.schedule((task.id, "due"), task.due, ("due", task))
+            keys.append((task.id, "due"))
+        if keys:
+            self.timer_keys[task.id] = keys
+
+    def cancel_timers(self, task_id, forget=False):
+        for key in self.timer_keys.pop(task_id, ()):
+            self.reminders.cancel(key)
+        if forget:
+            with self.reminder_lock:
+                self.reminded.pop(task_id, None)
+
+    def on_timer(self, key, payload, fire_time):
+        kind, task = payload
+        if kind == "remind":
+            self.queue_reminder(task, key[2], fire_time)
+        elif kind == "flush":
+            self.flush_reminders()
+        elif kind == "sync":
+            self.dispatcher.run_io(self.sync_store, on_done=self.apply_remote_changes, on_error=self.sync_failed)
+        else:
+            self.deliver(self.roll_over, task.id, task.due)
+
+    def roll_over(self, task_id, due):
+        task = self.tasks.get(task_id)
+        if task is None or task.status != "Pending" or task.due != due:
+            return
+        if not task.advance(time.time()):
+            return
+        logger.info("Task %s occurrence passed, next due %s %s", task.name, task.due_date, task.due_time)
+        self.queue_task(task)
+        self.schedule_reminder(task)
+        self.persist_task(task)
+        self.notify_listeners(changed=[task])
+
+    def queue_reminder(self, task, offset, fire_time):
+        REMINDERS_FIRED.inc()
+        with self.reminder_lock:
+            stages = self.reminded.get(task.id)
+            if stages is None or stages[0] != task.due:
+                stages = self.reminded[task.id] = (task.due, set())
+            stages[1].add(offset)
+            first = not self.pending_reminders
+            if task.id not in self.pending_reminders:
+                self.pending_reminders[task.id] = (fire_time, task)
+        if first:
+            flush_time = max(time.time() + REMINDER_BATCH_WINDOW, self.last_notification + REMINDER_MIN_INTERVAL)
+            self.reminders.schedule(("flush",), flush_time, ("flush", None))
+
+    def flush_reminders(self):
+        with self.reminder_lock:
+            batch = list(self.pending_reminders.values())
+            self.pending_reminders = {}
+        now = time.time()
+        batch = [(fire_time, task) for fire_time, task in batch if task.status == "Pending" and task.due > now and not self.graph.blocked(task.id)]
+        if not batch:
+            return
+        if not self.lease.leader:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Skipping %s reminder(s), another process holds the lease", len(batch))
+            return
+        self.last_notification = now
+        batch.sort(key=lambda item: (item[1].due, item[1].priority))
+        if len(batch) == 1:
+            task = batch[0][1]
+            title = "Task Reminder"
+            message = f"Task '{task.name}' (Priority: {task.priority_name}) is due in {format_duration(task.due - now)}!"
+        else:
+            title = f"{len(batch)} tasks due soon"
+            lines = [f"{task.name} ({task.priority_name}) in {format_duration(task.due - now)}" for _, task in batch[:REMINDER_SUMMARY_LINES]]
+            if len(batch) > REMINDER_SUMMARY_LINES:
+                lines.append(f"...and {len(batch) - REMINDER_SUMMARY_LINES} more")
+            message = "\n".join(lines)
+        fire_time = min(fire_time for fire_time, _ in batch)
+
+        def on_done(_):
+            logger.info("Reminder sent for %s task(s) (%.1fs after schedule)", len(batch), time.time() - fire_time)
+
+        def on_error(e):
+            logger.error("Failed to send reminder for %s task(s): %s", len(batch), e)
+            self.report_error("Notification Error", f"Failed to send notification: {str(e)}")
+        self.dispatcher.notify(title, message, on_done=on_done, on_error=on_error, fire_time=fire_time)
+
+    def test_notification(self, task):
+        def on_done(_):
+            logger.info("Test notification sent for task: %s", task.name)
+
+        def on_error(e):
+            logger.error("Failed to send test notification for %s: %s", task.name, e)
+            self.report_error("Notification Error", f"Failed to send test notification: {str(e)}")
+        self.dispatcher.notify("Test Notification", f"Test: Task '{task.name}' (Priority: {task.priority_name})", on_done=on_done, on_error=on_error)
+
+    def check_notifications(self):
+        logger.info("Notification thread started, %s reminder(s) scheduled", len(self.reminders))
+        self.reminders.run()
+        logger.info("Notification thread stopped")
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+class TaskFilter:
+    def __init__(self, text="", status=None, priority=None, start=None, end=None):
+        self.terms = tokenize(text)
+        self.status = status
+        self.priority = priority
+        self.start = start
+        self.end = end
+
+    @property
+    def active(self):
+        return bool(self.terms) or any(value is not None for value in (self.status, self.priority, self.start, self.end))
+
+    def matches(self, task):
+        if self.status is not None and task.status != self.status:
+            return False
+        if self.priority is not None and task.priority != self.priority:
+            return False
+        if self.start is not None and task.due < self.start:
+            return False
+        if self.end is not None and task.due >= self.end:
+            return False
+        if self.terms:
+            words = set(tokenize(f"{task.name} {task.description}"))
+            if not all(term in words for term in self.terms[:-1]):
+                return False
+            last = self.terms[-1]
+            if len(last) < PREFIX_MIN_LENGTH and last not in words or not any(word.startswith(last) for word in words):
+                return False
+        return True
+
+class TaskIndex:
+    def __init__(self):
+        self.entries = {}
+        self.postings = {}
+        self.vocabulary = []
+        self.by_status = {}
+        self.by_priority = {}
+        self.by_due = []
+        self.due_order = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def rebuild(self, tasks):
+        self.__init__()
+        for task in tasks:
+            tokens = frozenset(tokenize(f"{task.name} {task.description}"))
+            self.entries[task.id] = (tokens, task.status, task.priority, task.due)
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(task.id)
+            self.by_status.setdefault(task.status, set()).add(task.id)
+            self.by_priority.setdefault(task.priority, set()).add(task.id)
+            self.by_due.append((task.due, task.id))
+        self.vocabulary = sorted(self.postings)
+        self.by_due.sort()
+        self.due_order = [task_id for _, task_id in self.by_due]
+
+    def add(self, task):
+        self.remove(task.id)
+        tokens = frozenset(tokenize(f"{task.name} {task.description}"))
+        self.entries[task.id] = (tokens, task.status, task.priority, task.due)
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                bisect.insort(self.vocabulary, token)
+            ids.add(task.id)
+        self.by_status.setdefault(task.status, set()).add(task.id)
+        self.by_priority.setdefault(task.priority, set()).add(task.id)
+        key = (task.due, task.id)
+        index = bisect.bisect_left(self.by_due, key)
+        self.by_due.insert(index, key)
+        self.due_order.insert(index, task.id)
+
+    def remove(self, task_id):
+        entry = self.entries.pop(task_id, None)
+        if entry is None:
+            return
+        tokens, status, priority, due = entry
+        for token in tokens:
+            ids = self.postings[token]
+            ids.discard(task_id)
+            if not ids:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+        self.by_status[status].discard(task_id)
+        self.by_priority[priority].discard(task_id)
+        index = bisect.bisect_left(self.by_due, (due, task_id))
+        del self.by_due[index]
+        del self.due_order[index]
+
+    def update(self, changed=(), removed=()):
+        for task_id in removed:
+            self.remove(task_id)
+        for task in changed:
+            self.add(task)
+
+    def prefix_ids(self, prefix):
+        if len(prefix) < PREFIX_MIN_LENGTH:
+            return self.postings.get(prefix, set())
+        start = end = bisect.bisect_left(self.vocabulary, prefix)
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(prefix):
+            end += 1
+        if end - start == 1:
+            return self.postings[self.vocabulary[start]]
+        ids = set()
+        for token in self.vocabulary[start:end]:
+            ids.update(self.postings[token])
+        return ids
+
+    def due_ids(self, start, end):
+        low = 0 if start is None else bisect.bisect_left(self.by_due, (start,))
+        high = len(self.by_due) if end is None else bisect.bisect_left(self.by_due, (end,))
+        if 2 * (high - low) <= len(self.due_order):
+            return set(self.due_order[low:high]), False
+        excluded = set(self.due_order[:low])
+        excluded.update(self.due_order[high:])
+        return excluded, True
+
+    def search(self, query):
+        candidates = []
+        if query.status is not None:
+            candidates.append(self.by_status.get(query.status, set()))
+        if query.priority is not None:
+            candidates.append(self.by_priority.get(query.priority, set()))
+        for term in query.terms[:-1]:
+            candidates.append(self.postings.get(term, set()))
+        if query.terms:
+            candidates.append(self.prefix_ids(query.terms[-1]))
+        excluded = None
+        if query.start is not None or query.end is not None:
+            ids, exclude = self.due_ids(query.start, query.end)
+            if exclude:
+                excluded = ids
+            else:
+                candidates.append(ids)
+        if not candidates:
+            return self.entries.keys() - (excluded or ())
+        candidates.sort(key=len)
+        if not excluded and len(candidates) == 1:
+            return candidates[0]
+        result = candidates[0] - excluded if excluded else candidates[0].intersection(candidates[1])
+        result.intersection_update(*candidates[1 if excluded else 2:])
+        return result
+
+class TaskListView:
+    def __init__(self):
+        self.keys = []
+        self.key_by_id = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def sort_key(self, task):
+        return (task.priority, task.due, task.id)
+
+    def rebuild(self, tasks):
+        self.key_by_id = {task.id: self.sort_key(task) for task in tasks}
+        self.keys = sorted(self.key_by_id.values())
+
+    def insert(self, task):
+        self.remove(task.id)
+        key = self.sort_key(task)
+        self.key_by_id[task.id] = key
+        bisect.insort(self.keys, key)
+
+    def insert_many(self, tasks):
+        if len(tasks) < 64:
+            for task in tasks:
+                self.insert(task)
+            return
+        self.remove_many([task.id for task in tasks])
+        keys = [self.sort_key(task) for task in tasks]
+        self.key_by_id.update((key[-1], key) for key in keys)
+        self.keys.extend(keys)
+        self.keys.sort()
+
+    def remove(self, task_id):
+        key = self.key_by_id.pop(task_id, None)
+        if key is not None:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def remove_many(self, task_ids):
+        if len(task_ids) < 64:
+            for task_id in task_ids:
+                self.remove(task_id)
+            return
+        gone = {self.key_by_id.pop(task_id) for task_id in task_ids if task_id in self.key_by_id}
+        if gone:
+            self.keys = [key for key in self.keys if key not in gone]
+
+    def position(self, task_id):
+        key = self.key_by_id.get(task_id)
+        return None if key is None else bisect.bisect_left(self.keys, key)
+
+    def window(self, start, count):
+        return [key[-1] for key in self.keys[start:start + count]]
+
+class FilteredListView:
+    def __init__(self, view, task_ids, query=None):
+        self.view = view
+        self.task_ids = task_ids
+        self.shared = True
+        self.keys = []
+        self.key_by_id = {}
+        self.boundary = None
+        self.ranges = [((), (float("inf"),))]
+        if query is not None:
+            priorities = sorted(PRIORITY_MAP.values()) if query.priority is None else [query.priority]
+            start = float("-inf") if query.start is None else query.start
+            end = float("inf") if query.end is None else query.end
+            self.ranges = [((priority, start), (priority, end)) for priority in priorities]
+
+    def __len__(self):
+        return len(self.task_ids)
+
+    def own_ids(self):
+        if self.shared:
+            self.task_ids = set(self.task_ids)
+            self.shared = False
+
+    def insert_many(self, tasks):
+        self.remove_many([task.id for task in tasks])
+        for task in tasks:
+            self.task_ids.add(task.id)
+            key = self.view.sort_key(task)
+            if self.boundary is not None and key <= self.boundary:
+                self.key_by_id[task.id] = key
+                bisect.insort(self.keys, key)
+
+    def remove_many(self, task_ids):
+        self.own_ids()
+        for task_id in task_ids:
+            self.task_ids.discard(task_id)
+            key = self.key_by_id.pop(task_id, None)
+            if key is not None:
+                del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def window(self, start, count):
+        self.materialize(start + count)
+        return [key[-1] for key in self.keys[start:start + count]]
+
+    def materialize(self, wanted):
+        wanted = min(wanted, len(self.task_ids))
+        if len(self.keys) >= wanted:
+            return
+        keys = self.view.keys
+        if self.boundary is None and len(self.task_ids) * 64 <= len(keys):
+            key_by_id = self.view.key_by_id
+            self.keys = sorted(key_by_id[task_id] for task_id in self.task_ids if task_id in key_by_id)
+            self.key_by_id = {key[-1]: key for key in self.keys}
+            self.boundary = keys[-1]
+            return
+        resume = 0 if self.boundary is None else bisect.bisect_right(keys, self.boundary)
+        task_ids = self.task_ids
+        for low, high in self.ranges:
+            index = max(resume, bisect.bisect_left(keys, low))
+            stop = bisect.bisect_left(keys, high)
+            while index < stop and len(self.keys) < wanted:
+                chunk = keys[index:min(stop, index + FILTER_SCAN_CHUNK)]
+                index += len(chunk)
+                matches = [key for key in chunk if key[-1] in task_ids]
+                self.keys.extend(matches)
+                self.key_by_id.update((key[-1], key) for key in matches)
+                self.boundary = chunk[-1]
+            if len(self.keys) >= wanted:
+                return
+
+tk = ttk = messagebox = filedialog = Text = None
+
+def load_tkinter():
+    global tk, ttk, messagebox, filedialog, Text
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog, Text
 
 class TaskSchedulerApp:
-    def __init__(self, root):
+    def __init__(self, root, store=None, sink=None, on_ready=None):
+        load_tkinter()
         self.root = root
         self.root.title("Task Scheduler")
         self.root.geometry("600x600")
         self.root.configure(bg="#2e2e2e")
 
-        self.tasks = self.load_tasks()
-        self.task_queue = []
-        self.notification_thread = None
+        self.on_ready = on_ready
+        self.shown_seconds = None
+        self.loaded_seconds = None
+        self.loading = False
+        self.load_queue = queue.Queue()
         self.running = True
-        self.priority_map = {"High": 1, "Medium": 2, "Low": 3}
+        self.results = queue.Queue()
+        self.engine = SchedulerEngine(
+            store if store is not None else open_task_store(),
+            sink if sink is not None else PlyerSink(),
+            deliver=self.post_result,
+            on_error=messagebox.showerror
+        )
+        metrics.gauge("taskscheduler_startup_seconds", "Seconds from launch until the window was first drawn",
+                      lambda: float("nan") if self.shown_seconds is None else self.shown_seconds)
+
+        self.menubar = tk.Menu(root)
+        self.app_menu = tk.Menu(self.menubar, tearoff=0)
+        self.app_menu.add_command(label="Import Tasks...", command=self.import_tasks)
+        self.app_menu.add_command(label="Export Tasks...", command=self.export_tasks)
+        self.menubar.add_cascade(label="File", menu=self.app_menu)
+        root.config(menu=self.menubar)
 
         self.style = ttk.Style()
         self.style.theme_use("clam")
@@ -57,8 +2540,10 @@ class TaskSchedulerApp:
         self.add_file_button.grid(row=2, column=1, padx=10, pady=5, sticky="e")
 
         ttk.Label(root, text="Due Date:").grid(row=3, column=0, padx=10, pady=5, sticky="w")
-        self.cal = Calendar(root, selectmode="day", date_pattern="yyyy-mm-dd", background="#4a4a4a", foreground="white", selectbackground="#6b6b6b", font=("Times New Roman", 12))
-        self.cal.grid(row=3, column=1, padx=10, pady=5)
+        self.cal = None
+        self.date_entry = None
+        self.cal_placeholder = ttk.Label(root, text="Loading calendar...")
+        self.cal_placeholder.grid(row=3, column=1, padx=10, pady=5)
 
         ttk.Label(root, text="Due Time:").grid(row=4, column=0, padx=10, pady=5, sticky="w")
         self.time_frame = ttk.Frame(root)
@@ -68,19 +2553,88 @@ class TaskSchedulerApp:
         ttk.Label(self.time_frame, text=":").grid(row=0, column=1)
         self.minute_spin = ttk.Spinbox(self.time_frame, from_=0, to=59, width=5, format="%02.0f")
         self.minute_spin.grid(row=0, column=2)
+        ttk.Label(self.time_frame, text="  Remind before: ").grid(row=0, column=3)
+        self.remind_entry = ttk.Entry(self.time_frame, width=12)
+        self.remind_entry.grid(row=0, column=4)
 
         ttk.Label(root, text="Priority:").grid(row=5, column=0, padx=10, pady=5, sticky="w")
         self.priority_var = tk.StringVar(value="Medium")
         self.priority_menu = ttk.Combobox(root, textvariable=self.priority_var, values=["High", "Medium", "Low"], state="readonly")
         self.priority_menu.grid(row=5, column=1, padx=10, pady=5, sticky="w")
 
+        ttk.Label(root, text="Repeat:").grid(row=6, column=0, padx=10, pady=5, sticky="w")
+        self.repeat_frame = ttk.Frame(root)
+        self.repeat_frame.grid(row=6, column=1, padx=10, pady=5, sticky="w")
+        self.repeat_var = tk.StringVar(value="Never")
+        self.repeat_menu = ttk.Combobox(self.repeat_frame, textvariable=self.repeat_var, values=["Never", "Daily", "Weekly", "Monthly"], state="readonly", width=10)
+        self.repeat_menu.grid(row=0, column=0)
+        ttk.Label(self.repeat_frame, text=" every ").grid(row=0, column=1)
+        self.interval_spin = ttk.Spinbox(self.repeat_frame, from_=1, to=99, width=4)
+        self.interval_spin.set(1)
+        self.interval_spin.grid(row=0, column=2)
+        ttk.Label(self.repeat_frame, text=" times (0 = forever) ").grid(row=0, column=3)
+        self.count_spin = ttk.Spinbox(self.repeat_frame, from_=0, to=999, width=4)
+        self.count_spin.set(0)
+        self.count_spin.grid(row=0, column=4)
+
         self.add_button = ttk.Button(root, text="Add Task", command=self.add_task)
-        self.add_button.grid(row=6, column=0, padx=5, pady=10)
+        self.add_button.grid(row=7, column=0, padx=5, pady=10)
 
         self.test_notification_button = ttk.Button(root, text="Test Notification", command=self.test_notification)
-        self.test_notification_button.grid(row=6, column=1, padx=5, pady=10, sticky="e")
+        self.test_notification_button.grid(row=7, column=1, padx=5, pady=10, sticky="e")
+
+        self.stats_button = ttk.Button(root, text="Stats", command=self.show_stats)
+        self.stats_button.grid(row=7, column=1, padx=5, pady=10, sticky="w")
+
+        self.blocked_var = tk.BooleanVar(value=False)
+        self.blocked_check = ttk.Checkbutton(root, text="Blocked by selected tasks", variable=self.blocked_var)
+        self.blocked_check.grid(row=7, column=1, padx=5, pady=10)
+        self.stats_window = None
+        self.stats_text = None
+        self.details_window = None
+        self.details_labels = {}
 
-        self.task_tree = ttk.Treeview(root, columns=("S.No", "Task", "Due Date", "Due Time", "Priority", "Status"), show="headings")
+        self.task_filter = TaskFilter()
+        self.task_index = None
+        self.index_backlog = None
+        self.filter_job = None
+        self.filter_frame = ttk.Frame(root)
+        self.filter_frame.grid(row=8, column=0, columnspan=2, padx=10, pady=(5, 0), sticky="ew")
+        ttk.Label(self.filter_frame, text="Search:").grid(row=0, column=0, sticky="w")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.schedule_filter())
+        self.search_entry = ttk.Entry(self.filter_frame, textvariable=self.search_var, width=22)
+        self.search_entry.grid(row=0, column=1, columnspan=3, padx=5, sticky="we")
+        self.status_filter_var = tk.StringVar(value="All")
+        self.status_filter = ttk.Combobox(self.filter_frame, textvariable=self.status_filter_var, values=["All", "Pending", "Completed"], state="readonly", width=10)
+        self.status_filter.grid(row=0, column=4, padx=5)
+        self.status_filter.bind("<<ComboboxSelected>>", lambda event: self.apply_filter())
+        self.priority_filter_var = tk.StringVar(value="All")
+        self.priority_filter = ttk.Combobox(self.filter_frame, textvariable=self.priority_filter_var, values=["All", "High", "Medium", "Low"], state="readonly", width=8)
+        self.priority_filter.grid(row=0, column=5, padx=5)
+        self.priority_filter.bind("<<ComboboxSelected>>", lambda event: self.apply_filter())
+        ttk.Label(self.filter_frame, text="From:").grid(row=1, column=0, sticky="w")
+        self.from_entry = ttk.Entry(self.filter_frame, width=11)
+        self.from_entry.grid(row=1, column=1, padx=5, pady=(5, 0))
+        ttk.Label(self.filter_frame, text="To:").grid(row=1, column=2)
+        self.to_entry = ttk.Entry(self.filter_frame, width=11)
+        self.to_entry.grid(row=1, column=3, padx=5, pady=(5, 0))
+        for entry in (self.from_entry, self.to_entry):
+            entry.bind("<Return>", lambda event: self.apply_filter())
+            entry.bind("<FocusOut>", lambda event: self.apply_filter())
+        self.clear_filter_button = ttk.Button(self.filter_frame, text="Clear", command=self.clear_filter)
+        self.clear_filter_button.grid(row=1, column=4, padx=5, pady=(5, 0))
+        self.match_label = ttk.Label(self.filter_frame, text="")
+        self.match_label.grid(row=1, column=5, padx=5, pady=(5, 0), sticky="w")
+
+        self.task_frame = ttk.Frame(root)
+        self.task_frame.grid(row=9, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.all_tasks_view = TaskListView()
+        self.task_view = self.all_tasks_view
+        self.view_offset = 0
+        self.visible_rows = 20
+        self.rendered_rows = {}
+        self.task_tree = ttk.Treeview(self.task_frame, columns=("S.No", "Task", "Due Date", "Due Time", "Priority", "Status"), show="headings")
         self.task_tree.heading("S.No", text="S.No")
         self.task_tree.heading("Task", text="Task")
         self.task_tree.heading("Due Date", text="Due Date")
@@ -93,362 +2647,614 @@ class TaskSchedulerApp:
         self.task_tree.column("Due Time", width=80)
         self.task_tree.column("Priority", width=80)
         self.task_tree.column("Status", width=80)
-        self.task_tree.grid(row=7, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        self.task_tree.grid(row=0, column=0, sticky="nsew")
         self.task_tree.bind("<Double-1>", self.show_task_details)
         self.task_tree.bind("<Button-3>", self.show_file_menu)
+        self.task_tree.bind("<Configure>", self.on_task_tree_resize)
+        self.task_tree.bind("<MouseWheel>", self.on_task_tree_wheel)
+        self.task_tree.bind("<Button-4>", lambda event: self.scroll_task_list(-3))
+        self.task_tree.bind("<Button-5>", lambda event: self.scroll_task_list(3))
+        self.task_scrollbar = ttk.Scrollbar(self.task_frame, orient="vertical", command=self.on_task_scrollbar)
+        self.task_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.task_frame.grid_columnconfigure(0, weight=1)
+        self.task_frame.grid_rowconfigure(0, weight=1)
 
         self.complete_button = ttk.Button(root, text="Mark as Completed", command=self.mark_completed)
-        self.complete_button.grid(row=8, column=0, padx=5, pady=5)
+        self.complete_button.grid(row=10, column=0, padx=5, pady=5)
         self.delete_button = ttk.Button(root, text="Delete Task", command=self.delete_task)
-        self.delete_button.grid(row=8, column=1, padx=5, pady=5)
+        self.delete_button.grid(row=10, column=1, padx=5, pady=5)
+
+        self.load_label = ttk.Label(root, text="Loading tasks...")
+        self.load_label.grid(row=11, column=0, padx=10, pady=5, sticky="w")
+        self.load_progress = ttk.Progressbar(root, mode="determinate", maximum=100)
+        self.load_progress.grid(row=11, column=1, padx=10, pady=5, sticky="ew")
 
         root.grid_columnconfigure(1, weight=1)
-        root.grid_rowconfigure(7, weight=1)
+        root.grid_rowconfigure(9, weight=1)
+
+        self.engine.add_listener(self.update_task_rows)
+        self.set_editing(False)
+        self.root.after(50, self.drain_results)
+        self.root.after_idle(self.finish_startup)
 
-        self.rebuild_priority_queue()
+    def finish_startup(self):
+        self.root.update_idletasks()
+        self.shown_seconds = time.perf_counter() - STARTED_AT
+        if self.shown_seconds * 1000 > STARTUP_TARGET_MS:
+            logger.warning("Window took %.0f ms to appear, over the %.0f ms target", self.shown_seconds * 1000, STARTUP_TARGET_MS)
+        else:
+            logger.info("Window ready in %.0f ms (target %.0f ms)", self.shown_seconds * 1000, STARTUP_TARGET_MS)
+        self.load_tasks()
+        self.root.after_idle(self.build_calendar)
 
-        self.refresh_task_list()
+    def build_calendar(self):
+        try:
+            from tkcalendar import Calendar
+        except ImportError as e:
+            logger.error("Failed to load the calendar, using a plain date field: %s", e)
+            self.cal_placeholder.destroy()
+            self.date_entry = ttk.Entry(self.root)
+            self.date_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+            self.date_entry.grid(row=3, column=1, padx=10, pady=5)
+            return
+        self.cal = Calendar(self.root, selectmode="day", date_pattern="yyyy-mm-dd", background="#4a4a4a", foreground="white", selectbackground="#6b6b6b", font=("Times New Roman", 12))
+        self.cal_placeholder.destroy()
+        self.cal.grid(row=3, column=1, padx=10, pady=5)
 
-        self.notification_thread = threading.Thread(target=self.check_notifications, daemon=True)
-        self.notification_thread.start()
+    def set_editing(self, enabled):
+        for button in (self.add_button, self.complete_button, self.delete_button):
+            button.state(["!disabled" if enabled else "disabled"])
 
     def add_file(self):
         files = filedialog.askopenfilenames(filetypes=[("All files", "*.*")])
         self.file_list.extend(files)
         self.file_label.config(text=f"{len(self.file_list)} file(s) selected")
-        logging.info(f"Selected {len(files)} file(s) for attachment")
-        print(f"Selected {len(files)} file(s) for attachment")
+        logger.info("Selected %s file(s) for attachment", len(files))
 
     def show_task_details(self, event):
         item = self.task_tree.identify("item", event.x, event.y)
         column = self.task_tree.identify_column(event.x)
         if not item or column != "#2":
             return
-        task_index = int(self.task_tree.index(item))
-        task = self.tasks[task_index]
+        task = self.engine.tasks[item]
+        if self.details_window is None or not self.details_window.winfo_exists():
+            self.build_details_window()
+        window = self.details_window
+        labels = self.details_labels
+        window.title(f"Task Details: {task.name}")
+        labels["title"].config(text=f"Title: {task.name}")
+        labels["due_date"].config(text=f"Due Date: {task.due_date}")
+        labels["due_time"].config(text=f"Due Time: {task.due_time}")
+        labels["priority"].config(text=f"Priority: {task.priority_name}")
+        labels["status"].config(text=f"Status: {self.engine.status_label(task)}")
+        names = [self.engine.tasks[dep].name if dep in self.engine.tasks else f"{dep} (deleted)" for dep in task.depends]
+        labels["depends"].config(text=f"Depends on: {', '.join(names) or 'Nothing'}")
+        repeats = f"{task.recurrence.describe()} (occurrence {task.occurrence + 1})" if task.recurrence is not None else "Never"
+        labels["repeats"].config(text=f"Repeats: {repeats}")
+        reminders = ", ".join(format_offset(offset) for offset in task.reminder_offsets) or "None"
+        labels["reminders"].config(text=f"Reminders: {reminders}" + ("" if task.remind is not None else " (priority default)"))
+        self.details_desc.config(state="normal")
+        self.details_desc.delete("1.0", tk.END)
+        self.details_desc.insert("1.0", task.description)
+        self.details_desc.config(state="disabled")
+
+        for child in self.details_files.winfo_children():
+            child.destroy()
+        if task.files:
+            for entry in task.files:
+                btn = ttk.Button(self.details_files, text=self.engine.attachments.describe(entry), command=lambda fp=entry: self.open_file(fp))
+                btn.pack(pady=2, anchor="w")
+        else:
+            ttk.Label(self.details_files, text="No files attached").pack(pady=5, anchor="w")
+        window.deiconify()
+        window.lift()
+        logger.info("Opened details for task: %s", task.name)
 
+    def build_details_window(self):
         details_window = tk.Toplevel(self.root)
-        details_window.title(f"Task Details: {task['name']}")
         details_window.geometry("400x500")
         details_window.configure(bg="#2e2e2e")
+        details_window.protocol("WM_DELETE_WINDOW", details_window.withdraw)
 
-        ttk.Label(details_window, text=f"Title: {task['name']}", font=("Times New Roman", 14, "bold")).pack(pady=5)
-        ttk.Label(details_window, text=f"Due Date: {task['due_date']}").pack(pady=5)
-        ttk.Label(details_window, text=f"Due Time: {task['due_time']}").pack(pady=5)
-        ttk.Label(details_window, text=f"Priority: {task['priority']}").pack(pady=5)
-        ttk.Label(details_window, text=f"Status: {task['status']}").pack(pady=5)
+        self.details_labels = {"title": ttk.Label(details_window, font=("Times New Roman", 14, "bold"))}
+        self.details_labels["title"].pack(pady=5)
+        for key in ("due_date", "due_time", "priority", "status", "depends", "repeats", "reminders"):
+            self.details_labels[key] = ttk.Label(details_window, wraplength=360)
+            self.details_labels[key].pack(pady=5)
         ttk.Label(details_window, text="Description:", font=("Times New Roman", 12, "bold")).pack(pady=5, anchor="w", padx=10)
-        desc_text = Text(details_window, height=5, width=40, bg="#4a4a4a", fg="white", font=("Times New Roman", 12), wrap="word")
-        desc_text.insert("1.0", task.get("description", ""))
-        desc_text.config(state="disabled")
-        desc_text.pack(pady=5, padx=10)
+        self.details_desc = Text(details_window, height=5, width=40, bg="#4a4a4a", fg="white", font=("Times New Roman", 12), wrap="word")
+        self.details_desc.pack(pady=5, padx=10)
 
         ttk.Label(details_window, text="Attached Files:", font=("Times New Roman", 12, "bold")).pack(pady=5, anchor="w", padx=10)
-        if task.get("files", []):
-            for file_path in task["files"]:
-                file_name = os.path.basename(file_path)
-                btn = ttk.Button(details_window, text=file_name, command=lambda fp=file_path: self.open_file(fp))
-                btn.pack(pady=2, padx=10, anchor="w")
-        else:
-            ttk.Label(details_window, text="No files attached").pack(pady=5, padx=10, anchor="w")
-        logging.info(f"Opened details for task: {task['name']}")
-        print(f"Opened details for task: {task['name']}")
+        self.details_files = ttk.Frame(details_window)
+        self.details_files.pack(fill="x", padx=10)
+        self.details_window = details_window
 
-    def open_file(self, file_path):
-        try:
-            if os.path.exists(file_path):
-                subprocess.run(["start", "", file_path], shell=True, check=True)
-                logging.info(f"Opened file: {file_path}")
-                print(f"Opened file: {file_path}")
-            else:
-                messagebox.showerror("Error", f"File not found: {file_path}")
-                logging.error(f"File not found: {file_path}")
-                print(f"Error: File not found: {file_path}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open file: {str(e)}")
-            logging.error(f"Failed to open file: {str(e)}")
-            print(f"Error: Failed to open file: {str(e)}")
+    def open_file(self, entry):
+        self.engine.open_attachment(entry)
 
     def show_file_menu(self, event):
         item = self.task_tree.identify("item", event.x, event.y)
         if not item:
             return
-        task_index = int(self.task_tree.index(item))
-        task = self.tasks[task_index]
+        task = self.engine.tasks[item]
         self.file_menu = tk.Menu(self.root, tearoff=0)
-        files = task.get("files", [])
+        files = task.files
         if files:
-            for file_path in files:
-                file_name = os.path.basename(file_path)
-                self.file_menu.add_command(label=file_name, command=lambda fp=file_path: self.open_file(fp))
+            for entry in files:
+                self.file_menu.add_command(label=self.engine.attachments.describe(entry), command=lambda fp=entry: self.open_file(fp))
         else:
             self.file_menu.add_command(label="No files attached", state="disabled")
         self.file_menu.post(event.x_root, event.y_root)
-        logging.info(f"Opened file menu for task: {task['name']}")
-        print(f"Opened file menu for task: {task['name']}")
+        logger.info("Opened file menu for task: %s", task.name)
 
     def load_tasks(self):
-        try:
-            if os.path.exists(TASKS_FILE):
-                with open(TASKS_FILE, "r", encoding="utf-8") as f:
-                    tasks = json.load(f)
-                    valid_tasks = []
-                    required_keys = {"name", "due_date", "due_time", "status", "priority"}
-                    for task in tasks:
-                        if not isinstance(task, dict):
-                            continue
-                        if not all(key in task for key in required_keys):
-                            continue
-                        if not isinstance(task["name"], str) or not task["name"].strip():
-                            continue
-                        if task["status"] not in ["Pending", "Completed"]:
-                            continue
-                        if task["priority"] not in ["High", "Medium", "Low"]:
-                            continue
-                        if not isinstance(task.get("description", ""), str):
-                            task["description"] = ""
-                        if not isinstance(task.get("files", []), list):
-                            task["files"] = []
-                        try:
-                            datetime.strptime(f"{task['due_date']} {task['due_time']}", "%Y-%m-%d %H:%M")
-                            valid_tasks.append(task)
-                        except ValueError:
-                            logging.error(f"Invalid date/time for task: {task}")
-                            print(f"Error: Invalid date/time for task: {task}")
-                            continue
-                    logging.info(f"Loaded {len(valid_tasks)} valid tasks")
-                    print(f"Loaded {len(valid_tasks)} tasks from {TASKS_FILE}")
-                    return valid_tasks
-            return []
-        except json.JSONDecodeError:
-            messagebox.showerror("Error", "Failed to load tasks: Invalid JSON format")
-            logging.error("Failed to load tasks: Invalid JSON format")
-            print("Error: Failed to load tasks due to invalid JSON format")
-            return []
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load tasks: {str(e)}")
-            logging.error(f"Failed to load tasks: {str(e)}")
-            print(f"Error: Failed to load tasks: {str(e)}")
-            return []
+        self.loading = True
+        self.set_editing(False)
+        threading.Thread(target=self.engine.read_tasks, args=(lambda *message: self.load_queue.put(message),), daemon=True).start()
+        self.root.after(20, self.poll_loaded_tasks)
 
-    def save_tasks(self):
-        try:
-            with open(TASKS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.tasks, f, indent=4)
-            logging.info("Tasks saved successfully")
-            print(f"Saved tasks to {TASKS_FILE}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save tasks: {str(e)}")
-            logging.error(f"Failed to save tasks: {str(e)}")
-            print(f"Error: Failed to save tasks: {str(e)}")
+    def poll_loaded_tasks(self):
+        applied = 0
+        progress = None
+        finished = None
+        while applied < 20000 and finished is None:
+            try:
+                kind, payload, extra = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "batch":
+                self.engine.apply_records(payload)
+                applied += len(payload)
+                progress = extra
+            else:
+                finished = (kind, payload)
+        if progress is not None:
+            self.load_progress["value"] = progress * 100
+            self.load_label.config(text=f"Loading tasks... {len(self.engine.tasks)} loaded")
+        if finished is None:
+            self.root.after(1 if applied else 20, self.poll_loaded_tasks)
+            return
+        kind, payload = finished
+        self.loading = False
+        self.set_editing(True)
+        self.load_label.grid_remove()
+        self.load_progress.grid_remove()
+        if self.loaded_seconds is None:
+            self.loaded_seconds = time.perf_counter() - STARTED_AT
+            logger.info("Loaded %s task(s) %.0f ms after launch", len(self.engine.tasks), self.loaded_seconds * 1000)
+            if self.on_ready is not None:
+                self.on_ready(self.shown_seconds, self.loaded_seconds)
+        if kind == "error":
+            messagebox.showerror("Error", payload)
+        else:
+            self.engine.finish_loading(payload)
+        self.engine.start()
+        self.build_task_index()
 
-    def log_task(self, task):
-        try:
-            with open(LOG_FILE, "a", encoding="utf-8") as f:
-                log_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{log_time}] Completed: {task['name']} (Due: {task['due_date']} {task['due_time']}, Priority: {task['priority']})\n")
-            logging.info(f"Logged completed task: {task['name']}")
-            print(f"Logged completed task: {task['name']}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to log task: {str(e)}")
-            logging.error(f"Failed to log task: {str(e)}")
-            print(f"Error: Failed to log task: {str(e)}")
-
-    def rebuild_priority_queue(self):
-        self.task_queue = []
-        for idx, task in enumerate(self.tasks):
-            if task["status"] == "Pending":
-                try:
-                    due_datetime = datetime.strptime(f"{task['due_date']} {task['due_time']}", "%Y-%m-%d %H:%M")
-                    priority_num = self.priority_map[task["priority"]]
-                    heapq.heappush(self.task_queue, (priority_num, due_datetime, idx))
-                except ValueError:
-                    logging.error(f"Failed to add task to queue: {task}")
-                    print(f"Error: Failed to add task to queue: {task}")
-                    continue
-        logging.info(f"Rebuilt priority queue with {len(self.task_queue)} tasks")
-        print(f"Rebuilt priority queue with {len(self.task_queue)} tasks")
+    def build_task_index(self):
+        tasks = list(self.engine.tasks.values())
+        self.index_backlog = []
+
+        def build():
+            start = time.perf_counter()
+            index = TaskIndex()
+            index.rebuild(tasks)
+            logger.info("Built search index for %s tasks in %.3fs", len(index), time.perf_counter() - start)
+            self.post_result(self.install_task_index, index)
+        threading.Thread(target=build, daemon=True).start()
+
+    def install_task_index(self, index):
+        for changed, removed in self.index_backlog:
+            index.update(changed, removed)
+        self.index_backlog = None
+        self.task_index = index
+
+    def post_result(self, callback, *args):
+        self.results.put((callback, args))
+
+    def drain_results(self):
+        while True:
+            try:
+                callback, args = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error("Result callback failed: %s", e)
+        if self.running:
+            self.root.after(50, self.drain_results)
 
     def add_task(self):
+        if self.cal is not None:
+            due_date = self.cal.get_date()
+        elif self.date_entry is not None:
+            due_date = self.date_entry.get().strip()
+        else:
+            messagebox.showwarning("Warning", "The calendar is still loading, please try again")
+            logger.warning("Calendar not ready yet, task not added")
+            return
         task_name = self.title_entry.get().strip()
         description = self.desc_text.get("1.0", tk.END).strip()
-        due_date = self.cal.get_date()
         due_time = f"{self.hour_spin.get().zfill(2)}:{self.minute_spin.get().zfill(2)}"
         priority = self.priority_var.get()
+        remind_text = self.remind_entry.get().strip()
+        depends = self.task_tree.selection() if self.blocked_var.get() else ()
         files = self.file_list[:]
 
         if not task_name:
             messagebox.showwarning("Warning", "Task title cannot be empty")
-            logging.info("Task title empty")
-            print("Warning: Task title cannot be empty")
+            logger.warning("Task title cannot be empty")
+            return
+
+        try:
+            remind = None
+            if remind_text.lower() == "none":
+                remind = ()
+            elif remind_text:
+                remind = parse_offsets(remind_text)
+        except ValueError as e:
+            messagebox.showwarning("Warning", f"{e}. Use offsets like 1d, 1h, 5m")
+            logger.error("Invalid reminder offsets: %s", remind_text)
             return
 
         try:
-            due_datetime = datetime.strptime(f"{due_date} {due_time}", "%Y-%m-%d %H:%M")
-            task = {
-                "name": task_name,
-                "description": description,
-                "due_date": due_date,
-                "due_time": due_time,
-                "priority": priority,
-                "status": "Pending",
-                "files": files
-            }
-            self.tasks.append(task)
-            self.save_tasks()
-            self.rebuild_priority_queue()
-            self.refresh_task_list()
+            due = parse_due(due_date, due_time)
+            recurrence = None
+            if self.repeat_var.get() != "Never":
+                count = int(self.count_spin.get())
+                recurrence = Recurrence(self.repeat_var.get().lower(), due, int(self.interval_spin.get()), count or None)
+            task = Task(uuid.uuid4().hex, task_name, due, PRIORITY_MAP[priority], "Pending", description, None, recurrence, remind=remind, depends=depends)
+            if not self.engine.add_task(task):
+                return
+            if files:
+                self.engine.attach_files(task.id, files)
             self.title_entry.delete(0, tk.END)
             self.desc_text.delete("1.0", tk.END)
             self.file_list.clear()
             self.file_label.config(text="No files selected")
-            logging.info(f"Added task: {task_name}, Due: {due_date} {due_time}")
-            print(f"Added task: {task_name}, Due: {due_date} {due_time}")
-            time_diff_seconds = (due_datetime - datetime.now()).total_seconds()
-            time_diff_hours = time_diff_seconds / 3600
-            logging.info(f"Task {task_name} time diff: {time_diff_seconds} seconds")
-            print(f"Task {task_name} time diff: {time_diff_seconds} seconds")
-            if time_diff_seconds <= 0:
-                logging.info(f"Task {task_name} is past due, no notification sent")
-                print(f"Task {task_name} is past due, no notification sent")
-            elif time_diff_hours <= 1:
-                try:
-                    notification.notify(
-                        title="Task Reminder",
-                        message=f"Task '{task_name}' (Priority: {priority}) is due soon!",
-                        app_name="TaskScheduler",
-                        timeout=10
-                    )
-                    logging.info(f"Immediate 1-hour notification sent for task: {task_name}")
-                    print(f"Immediate 1-hour notification sent for task: {task_name}")
-                except Exception as e:
-                    logging.error(f"Failed to send immediate notification for {task_name}: {str(e)}")
-                    print(f"Error: Failed to send immediate notification for {task_name}: {str(e)}")
-                    messagebox.showerror("Notification Error", f"Failed to send notification: {str(e)}")
+            self.repeat_var.set("Never")
+            self.remind_entry.delete(0, tk.END)
+            self.blocked_var.set(False)
         except ValueError:
             messagebox.showwarning("Warning", "Invalid date or time format")
-            logging.error(f"Invalid date/time format: {due_date} {due_time}")
-            print(f"Error: Invalid date/time format: {due_date} {due_time}")
+            logger.error("Invalid date/time format: %s %s", due_date, due_time)
 
     def mark_completed(self):
         selected = self.task_tree.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select a task")
-            logging.info("No task selected for marking completed")
-            print("Warning: Please select a task")
+            logger.warning("Please select a task")
             return
 
-        for item in selected:
-            task_index = int(self.task_tree.index(item))
-            if self.tasks[task_index]["status"] != "Completed":
-                self.tasks[task_index]["status"] = "Completed"
-                self.log_task(self.tasks[task_index])
-        self.save_tasks()
-        self.rebuild_priority_queue()
-        self.refresh_task_list()
+        if len(selected) == 1:
+            self.engine.complete_task(selected[0])
+        else:
+            self.engine.complete_tasks(selected)
 
     def delete_task(self):
         selected = self.task_tree.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select a task")
-            logging.info("No task selected for deletion")
-            print("Warning: Please select a task")
+            logger.warning("Please select a task")
             return
 
         if messagebox.askyesno("Confirm", "Are you sure you want to delete the selected task(s)?"):
-            for item in selected:
-                task_index = int(self.task_tree.index(item))
-                self.tasks.pop(task_index)
-            self.save_tasks()
-            self.rebuild_priority_queue()
-            self.refresh_task_list()
-
-    def refresh_task_list(self):
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        sorted_tasks = sorted(
-            [(self.priority_map[task["priority"]], datetime.strptime(f"{task['due_date']} {task['due_time']}", "%Y-%m-%d %H:%M"), task) for task in self.tasks],
-            key=lambda x: (x[0], x[1])
+            if len(selected) == 1:
+                self.engine.delete_task(selected[0])
+            else:
+                self.engine.delete_tasks(selected)
+
+    def import_tasks(self):
+        path = filedialog.askopenfilename(title="Import Tasks", filetypes=[("Task files", "*.csv *.json"), ("CSV files", "*.csv"), ("JSON files", "*.json")])
+        if not path:
+            return
+        self.engine.import_file(path, on_done=lambda count: messagebox.showinfo("Import", f"Imported {count} task(s)"))
+
+    def export_tasks(self):
+        path = filedialog.asksaveasfilename(title="Export Tasks", defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json")])
+        if not path:
+            return
+        self.engine.export_file(path, on_done=lambda count: messagebox.showinfo("Export", f"Exported {count} task(s)"))
+
+    def update_task_rows(self, changed=(), removed=()):
+        if self.task_index is not None:
+            self.task_index.update(changed, removed)
+        elif self.index_backlog is not None:
+            self.index_backlog.append((list(changed), list(removed)))
+        self.all_tasks_view.remove_many(removed)
+        self.all_tasks_view.insert_many(changed)
+        if self.task_filter.active:
+            matching = [task for task in changed if self.task_filter.matches(task)]
+            if len(matching) != len(changed):
+                removed = list(removed)
+                removed.extend(task.id for task in changed if not self.task_filter.matches(task))
+            changed = matching
+            self.task_view.remove_many(removed)
+            self.task_view.insert_many(changed)
+        self.render_task_rows()
+        if self.task_filter.active:
+            self.match_label.config(text=f"{len(self.task_view)} of {len(self.engine.tasks)} tasks")
+
+    def parse_filter_date(self, entry, offset=0):
+        text = entry.get().strip()
+        if not text:
+            return None
+        try:
+            return parse_due(text, "00:00") + offset
+        except ValueError:
+            logger.warning("Ignoring invalid filter date: %s", text)
+            return None
+
+    def read_filter(self):
+        status = self.status_filter_var.get()
+        priority = self.priority_filter_var.get()
+        return TaskFilter(
+            self.search_var.get(),
+            None if status == "All" else status,
+            PRIORITY_MAP.get(priority),
+            self.parse_filter_date(self.from_entry),
+            self.parse_filter_date(self.to_entry, 86400)
         )
-        for idx, (_, _, task) in enumerate(sorted_tasks, 1):
-            self.task_tree.insert("", tk.END, values=(idx, task["name"], task["due_date"], task["due_time"], task["priority"], task["status"]))
-        logging.info("Task list refreshed")
-        print("Task list refreshed")
 
-    def check_notifications(self):
-        while self.running:
-            current_time = datetime.now()
-            logging.info(f"Checking notifications at {current_time}, queue size: {len(self.task_queue)}")
-            print(f"Checking notifications at {current_time}, queue size: {len(self.task_queue)}")
-            for priority_num, due_datetime, task_index in self.task_queue[:]:
-                task = self.tasks[task_index]
-                if task["status"] == "Pending":
-                    time_diff_seconds = (due_datetime - current_time).total_seconds()
-                    time_diff_hours = time_diff_seconds / 3600
-                    logging.info(f"Task: {task['name']}, Time diff: {time_diff_seconds} seconds")
-                    print(f"Task: {task['name']}, Time diff: {time_diff_seconds} seconds")
-                    if time_diff_seconds <= 0:
-                        self.task_queue.remove((priority_num, due_datetime, task_index))
-                        heapq.heapify(self.task_queue)
-                        logging.info(f"Task {task['name']} is past due, removed from queue")
-                        print(f"Task {task['name']} is past due, removed from queue")
-                    elif 0 < time_diff_hours <= 1:
-                        try:
-                            notification.notify(
-                                title="Task Reminder",
-                                message=f"Task '{task['name']}' (Priority: {task['priority']}) is due in 1 hour!",
-                                app_name="TaskScheduler",
-                                timeout=10
-                            )
-                            logging.info(f"1-hour notification sent for task: {task['name']}")
-                            print(f"1-hour notification sent for task: {task['name']}")
-                            self.task_queue.remove((priority_num, due_datetime, task_index))
-                            heapq.heapify(self.task_queue)
-                        except Exception as e:
-                            logging.error(f"Failed to send 1-hour notification for {task['name']}: {str(e)}")
-                            print(f"Error: Failed to send 1-hour notification for {task['name']}: {str(e)}")
-                            messagebox.showerror("Notification Error", f"Failed to send notification: {str(e)}")
-            time.sleep(15)  
+    def schedule_filter(self):
+        if self.filter_job is not None:
+            self.root.after_cancel(self.filter_job)
+        self.filter_job = self.root.after(SEARCH_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self.filter_job = None
+        self.task_filter = self.read_filter()
+        with tracer.span("search"):
+            if not self.task_filter.active:
+                self.task_view = self.all_tasks_view
+                self.match_label.config(text="")
+            else:
+                if self.task_index is not None:
+                    matches = self.task_index.search(self.task_filter)
+                else:
+                    matches = {task.id for task in self.engine.tasks.values() if self.task_filter.matches(task)}
+                self.task_view = FilteredListView(self.all_tasks_view, matches, self.task_filter)
+                self.match_label.config(text=f"{len(self.task_view)} of {len(self.engine.tasks)} tasks")
+        self.view_offset = 0
+        self.render_task_rows()
+
+    def clear_filter(self):
+        self.search_var.set("")
+        self.status_filter_var.set("All")
+        self.priority_filter_var.set("All")
+        self.from_entry.delete(0, "end")
+        self.to_entry.delete(0, "end")
+        self.apply_filter()
+
+    def render_task_rows(self):
+        with tracer.span("render_rows"):
+            self._render_task_rows()
+
+    def _render_task_rows(self):
+        total = len(self.task_view)
+        self.view_offset = max(0, min(self.view_offset, total - self.visible_rows))
+        wanted = self.task_view.window(self.view_offset, self.visible_rows)
+        wanted_ids = set(wanted)
+        stale = [item for item in self.task_tree.get_children() if item not in wanted_ids]
+        if stale:
+            self.task_tree.delete(*stale)
+            for item in stale:
+                self.rendered_rows.pop(item, None)
+        for row, task_id in enumerate(wanted):
+            task = self.engine.tasks[task_id]
+            values = (self.view_offset + row + 1, task.name, task.due_date, task.due_time, task.priority_name, self.engine.status_label(task))
+            if task_id not in self.rendered_rows:
+                self.task_tree.insert("", row, iid=task_id, values=values)
+            else:
+                if self.rendered_rows[task_id] != values:
+                    self.task_tree.item(task_id, values=values)
+                if self.task_tree.index(task_id) != row:
+                    self.task_tree.move(task_id, "", row)
+            self.rendered_rows[task_id] = values
+        if total:
+            self.task_scrollbar.set(self.view_offset / total, min(1.0, (self.view_offset + self.visible_rows) / total))
+        else:
+            self.task_scrollbar.set(0.0, 1.0)
+
+    def scroll_task_list(self, rows):
+        offset = max(0, min(self.view_offset + rows, len(self.task_view) - self.visible_rows))
+        if offset != self.view_offset:
+            self.view_offset = offset
+            self.render_task_rows()
+
+    def on_task_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.view_offset = int(float(amount) * len(self.task_view))
+            self.render_task_rows()
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_task_list(int(amount) * step)
+
+    def on_task_tree_wheel(self, event):
+        self.scroll_task_list(-3 if event.delta > 0 else 3)
+
+    def on_task_tree_resize(self, event):
+        row_height = int(self.style.lookup("Treeview", "rowheight") or 20)
+        rows = max(1, (event.height - row_height) // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render_task_rows()
 
     def test_notification(self):
         selected = self.task_tree.selection()
         if not selected:
             messagebox.showwarning("Warning", "Please select a task to test notification")
-            logging.info("No task selected for test notification")
-            print("Warning: Please select a task to test notification")
+            logger.warning("Please select a task to test notification")
             return
-        try:
-            task_index = int(self.task_tree.index(selected[0]))
-            task = self.tasks[task_index]
-            notification.notify(
-                title="Test Notification",
-                message=f"Test: Task '{task['name']}' (Priority: {task['priority']})",
-                app_name="TaskScheduler",
-                timeout=10
-            )
-            logging.info(f"Test notification sent for task: {task['name']}")
-            print(f"Test notification sent for task: {task['name']}")
-        except Exception as e:
-            logging.error(f"Failed to send test notification for {task['name']}: {str(e)}")
-            print(f"Error: Failed to send test notification for {task['name']}: {str(e)}")
-            messagebox.showerror("Notification Error", f"Failed to send test notification: {str(e)}")
+        self.engine.test_notification(self.engine.tasks[selected[0]])
+
+    def show_stats(self):
+        if self.stats_window is not None and self.stats_window.winfo_exists():
+            self.stats_window.lift()
+            return
+        self.stats_window = tk.Toplevel(self.root)
+        self.stats_window.title("Scheduler Stats")
+        self.stats_window.geometry("520x420")
+        self.stats_window.configure(bg="#2e2e2e")
+        self.stats_text = Text(self.stats_window, bg="#4a4a4a", fg="white", font=("Courier New", 10), wrap="none")
+        self.stats_text.pack(fill="both", expand=True, padx=10, pady=10)
+        self.refresh_stats()
+
+    def refresh_stats(self):
+        if not self.running or self.stats_window is None or not self.stats_window.winfo_exists():
+            self.stats_window = None
+            return
+        self.stats_text.config(state="normal")
+        self.stats_text.delete("1.0", "end")
+        self.stats_text.insert("1.0", "\n".join(metrics.summary()))
+        self.stats_text.config(state="disabled")
+        self.root.after(1000, self.refresh_stats)
 
     def on_closing(self):
         self.running = False
-        if self.notification_thread:
-            self.notification_thread.join(timeout=1.0)
+        self.engine.stop()
         self.root.destroy()
 
-def main():
-    print("Starting Task Scheduler app")
-    root = tk.Tk()
-    app = TaskSchedulerApp(root)
-    root.protocol("WM_DELETE_WINDOW", app.on_closing)
-    root.mainloop()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Task Scheduler")
+    parser.add_argument("--headless", action="store_true", help="run the reminder engine without opening the window")
+    parser.add_argument("--sink", choices=sorted(SINKS), help="where reminders are delivered (default: plyer, or log when headless)")
+    parser.add_argument("--webhook-url", help="URL that the webhook sink POSTs reminders to")
+    parser.add_argument("--storage", choices=["journal", "sqlite"], default=STORAGE_MODE, help="task storage backend")
+    parser.add_argument("--log-level", default=LOG_LEVEL, choices=["DEBUG", "INFO", "WARNING", "ERROR"], type=str.upper, help="minimum level written to the console and debug log")
+    parser.add_argument("--import", dest="import_file", metavar="FILE", help="add or update tasks from a CSV or JSON file, then exit")
+    parser.add_argument("--export", dest="export_file", metavar="FILE", help="write all tasks to a CSV or JSON file, then exit")
+    parser.add_argument("--next", type=int, metavar="N", help="print the next N ready tasks by priority, then exit")
+    parser.add_argument("--due-within", type=float, metavar="SECONDS", help="print the pending tasks due within SECONDS, then exit")
+    parser.add_argument("--metrics-port", type=int, default=METRICS_PORT, help="serve Prometheus metrics on this local port")
+    parser.add_argument("--trace", action="store_true", default=TRACE_ENABLED, help="record per-operation latency histograms and log them on exit")
+    parser.add_argument("--startup-check", action="store_true", help="open the window, report how long it took to appear and load tasks, then exit (non-zero if over the startup target)")
+    return parser.parse_args(argv)
 
-if __name__ == "__main__":
-    main()
+def run_headless(args):
+    logger.info("Starting Task Scheduler engine (headless)")
+    results = queue.SimpleQueue()
+    engine = SchedulerEngine(
+        open_task_store(args.storage),
+        make_sink(args.sink or "log", args.webhook_url),
+        deliver=lambda callback, *args: results.put((callback, args))
+    )
+    engine.on_error = lambda title, message: print(f"{title}: {message}", file=sys.stderr)
+    if not engine.load():
+        engine.stop()
+        return 1
+    signal.signal(signal.SIGTERM, lambda signum, frame: results.put(None))
+    engine.start()
+    try:
+        while True:
+            try:
+                item = results.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            callback, callback_args = item
+            try:
+                callback(*callback_args)
+            except Exception as e:
+                logger.error("Engine callback failed: %s", e)
+    except KeyboardInterrupt:
+        pass
+    logger.info("Stopping Task Scheduler engine")
+    engine.stop()
+    return 0
 
+def run_transfer(args):
+    engine = SchedulerEngine(open_task_store(args.storage), LogSink())
+    engine.on_error = lambda title, message: print(f"{title}: {message}", file=sys.stderr)
+    try:
+        if not engine.load():
+            return 1
+        if args.import_file:
+            saved, removed = engine.apply_batch(puts=read_task_file(args.import_file), persist=False)
+            engine.store.write_batch(saved, removed)
+        if args.export_file:
+            write_task_file(args.export_file, sorted(engine.tasks.values(), key=lambda task: (task.priority, task.due, task.id)))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        logger.error("Failed to transfer tasks: %s", e)
+        return 1
+    finally:
+        engine.stop()
+    return 0
 
+def run_query(args):
+    store = open_task_store(args.storage)
+    if args.next is not None and not isinstance(store, SqliteTaskStore):
+        return run_next_ready(args, store)
+    try:
+        if isinstance(store, SqliteTaskStore):
+            payloads = store.next_pending(args.next) if args.next is not None else store.due_within(args.due_within)
+            tasks = [task for task in map(validate_task, payloads) if task is not None]
+        else:
+            now = time.time()
+            tasks = [task for task in map(validate_task, store.load()) if task is not None and task.status == "Pending"]
+            tasks = sorted((task for task in tasks if now <= task.due < now + args.due_within), key=lambda task: (task.due, task.id))
+    except (OSError, sqlite3.Error) as e:
+        logger.error("Failed to query tasks: %s", e)
+        return 1
+    finally:
+        if isinstance(store, SqliteTaskStore):
+            store.close()
+        else:
+            store.close(compact=False)
+    print_tasks(tasks)
+    return 0
+
+def run_next_ready(args, store):
+    engine = SchedulerEngine(store, LogSink())
+    engine.on_error = lambda title, message: print(f"{title}: {message}", file=sys.stderr)
+    try:
+        if not engine.load():
+            return 1
+        tasks = engine.next_ready(args.next)
+    finally:
+        engine.stop()
+    print_tasks(tasks)
+    return 0
+
+def print_tasks(tasks):
+    for task in tasks:
+        print(f"{task.due_date} {task.due_time}  {task.priority_name:<6}  {task.name}")
 
-    
\ No newline at end of file
+def main(argv=None):
+    args = parse_args(argv)
+    setup_logging(args.log_level, trace=args.trace)
+    metrics_server = None
+    if args.metrics_port:
+        metrics_server = MetricsServer(metrics, args.metrics_port)
+        metrics_server.start()
+    try:
+        if args.import_file or args.export_file:
+            sys.exit(run_transfer(args))
+        if args.next is not None or args.due_within is not None:
+            sys.exit(run_query(args))
+        if args.headless:
+            sys.exit(run_headless(args))
+        logger.info("Starting Task Scheduler app")
+        load_tkinter()
+        root = tk.Tk()
+        status = []
+        on_ready = None
+        if args.startup_check:
+            def on_ready(shown, loaded):
+                print(f"Window shown in {shown * 1000:.0f} ms, tasks loaded in {loaded * 1000:.0f} ms (target {STARTUP_TARGET_MS:.0f} ms)")
+                status.append(0 if shown * 1000 <= STARTUP_TARGET_MS else 1)
+                root.after(0, app.on_closing)
+        app = TaskSchedulerApp(root, store=open_task_store(args.storage), sink=make_sink(args.sink or "plyer", args.webhook_url), on_ready=on_ready)
+        root.protocol("WM_DELETE_WINDOW", app.on_closing)
+        root.mainloop()
+        if status:
+            sys.exit(status[0])
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+PRIORITY_WEIGHTS = {1: 20, 2: 50, 3: 30}
+VISIBLE_ROWS = 30
+UPDATE_BATCH = 100
+PUT_SAMPLES = 1000
+SOON_SECONDS = 3600
+
+class FakeSink:
+    def __init__(self):
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    def send(self, title, message):
+        with self.lock:
+            self.sent += 1
+
+def make_tasks(ts, count, seed):
+    rng = random.Random(seed)
+    now = int(time.time())
+    priorities = list(PRIORITY_WEIGHTS)
+    weights = list(PRIORITY_WEIGHTS.values())
+    tasks = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.10:
+            due = now - rng.randint(60, 30 * 86400)
+        elif roll < 0.11:
+            due = now + rng.randint(60, SOON_SECONDS)
+        elif roll < 0.40:
+            due = now + rng.randint(SOON_SECONDS, 7 * 86400)
+        else:
+            due = now + rng.randint(7 * 86400, 365 * 86400)
+        due -= due % 60
+        recurrence = None
+        if rng.random() < 0.05:
+            recurrence = ts.Recurrence(rng.choice(list(ts.RECURRENCE_PERIODS)), due)
+        tasks.append(ts.Task(
+            f"{i:08x}",
+            f"Task {i}",
+            due,
+            rng.choices(priorities, weights)[0],
+            "Completed" if rng.random() < 0.25 else "Pending",
+            "Synthetic benchmark task" if i % 3 else "",
+            recurrence=recurrence
+        ))
+    return tasks
+
+def open_store(ts, storage, workdir):
+    if storage == "sqlite":
+        return ts.SqliteTaskStore(os.path.join(workdir, ts.DB_FILE))
+    return ts.JournalStore(os.path.join(workdir, ts.TASKS_FILE), os.path.join(workdir, ts.JOURNAL_FILE))
+
+class Phases:
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.results = {}
+
+    @contextlib.contextmanager
+    def measure(self, name, **extra):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield extra
+        elapsed = time.perf_counter() - start
+        result = {"seconds": round(elapsed, 6)}
+        if self.trace_memory:
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+        result.update(extra)
+        self.results[name] = result
+
+def run_case(ts, storage, size, seed, trace_memory):
+    phases = Phases(trace_memory)
+    with tempfile.TemporaryDirectory(prefix="taskscheduler-bench-") as workdir:
+        tasks = make_tasks(ts, size, seed)
+
+        store = open_store(ts, storage, workdir)
+        with phases.measure("save_tasks"):
+            store.reset(tasks, compact=True)
+            store.compact(wait=True)
+        sample = tasks[:PUT_SAMPLES]
+        with phases.measure("save_task", operations=len(sample)):
+            for task in sample:
+                store.put(task)
+            store.close()
+        phases.results["save_task"]["seconds_per_operation"] = round(phases.results["save_task"]["seconds"] / len(sample), 9)
+        del tasks
+
+        sink = FakeSink()
+        engine = ts.SchedulerEngine(open_store(ts, storage, workdir), sink)
+        with phases.measure("load_tasks"):
+            loaded = engine.load()
+        if not loaded:
+            raise RuntimeError(f"Benchmark store failed to load ({storage}, {size} tasks)")
+
+        with phases.measure("rebuild_priority_queue", queued=0) as extra:
+            engine.task_queue.clear()
+            for task in engine.tasks.values():
+                engine.queue_task(task)
+            extra["queued"] = len(engine.task_queue)
+
+        view = ts.TaskListView()
+        with phases.measure("refresh_task_list", rows=VISIBLE_ROWS):
+            view.rebuild(engine.tasks.values())
+            view.window(0, VISIBLE_ROWS)
+        changed = list(engine.tasks.values())[:UPDATE_BATCH]
+        for task in changed:
+            task.priority = task.priority % 3 + 1
+        with phases.measure("update_task_rows", changed=len(changed)):
+            view.insert_many(changed)
+            view.window(0, VISIBLE_ROWS)
+
+        engine.reminders.stop()
+        engine.reminders = ts.ReminderScheduler(engine.on_timer)
+        with phases.measure("schedule_reminders", scheduled=0) as extra:
+            for task in engine.tasks.values():
+                engine.schedule_reminder(task)
+            extra["scheduled"] = len(engine.reminders)
+
+        now = time.time()
+        due_now = sum(1 for task in engine.tasks.values()
+                      if task.status == "Pending" and task.reminder_offsets and now < task.due <= now + task.reminder_offsets[-1])
+        with phases.measure("check_notifications", due=due_now, sent=0) as extra:
+            engine.start()
+            while True:
+                next_fire = engine.reminders.next_fire_time()
+                if next_fire is None or next_fire > time.time():
+                    break
+                time.sleep(0.001)
+            engine.flush_reminders()
+            engine.dispatcher.notify_pool.jobs.join()
+            extra["sent"] = sink.sent
+        engine.stop()
+    return phases.results
+
+def run(sizes, storages, seed, trace_memory):
+    import TaskScheduler as ts
+    ts.setup_logging(console=False)
+    results = []
+    for storage in storages:
+        for size in sizes:
+            print(f"Benchmarking {size} tasks ({storage})", file=sys.stderr)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                timings = run_case(ts, storage, size, seed, False)
+                if trace_memory:
+                    tracemalloc.start()
+                    try:
+                        memory = run_case(ts, storage, size, seed, True)
+                    finally:
+                        tracemalloc.stop()
+                    for name, result in memory.items():
+                        timings[name]["peak_bytes"] = result["peak_bytes"]
+            results.append({"storage": storage, "tasks": size, "phases": timings})
+    return results
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Task Scheduler engine without a display")
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")], default=DEFAULT_SIZES,
+                        help="comma separated task counts (default: 1000,10000,100000)")
+    parser.add_argument("--storage", choices=["journal", "sqlite", "all"], default="all", help="storage backend to benchmark")
+    parser.add_argument("--seed", type=int, default=1204, help="seed for the synthetic task generator")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass that records peak memory")
+    parser.add_argument("--output", help="write the JSON results to this file instead of stdout")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    storages = ["journal", "sqlite"] if args.storage == "all" else [args.storage]
+    output_path = os.path.abspath(args.output) if args.output else None
+    workdir = tempfile.mkdtemp(prefix="taskscheduler-bench-logs-")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.chdir(workdir)
+    print(f"Debug log for this run: {os.path.join(workdir, 'scheduler_debug.log')}", file=sys.stderr)
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": run(args.sizes, storages, args.seed, not args.no_memory),
+    }
+    output = json.dumps(report, indent=2)
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
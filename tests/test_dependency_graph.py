@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TaskScheduler as ts
+
+
+class DependencyGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.due = time.time() + 3600
+        self.graph = ts.DependencyGraph()
+
+    def task(self, task_id, depends=(), status="Pending"):
+        return ts.Task(task_id, task_id.upper(), self.due, 2, status, depends=depends)
+
+    def test_completing_last_prerequisite_unblocks_dependent(self):
+        self.graph.update(self.task("a"))
+        self.graph.update(self.task("b"))
+        self.graph.update(self.task("c", depends=["a", "b"]))
+        self.assertTrue(self.graph.blocked("c"))
+        self.assertEqual(sorted(self.graph.blockers("c")), ["a", "b"])
+
+        self.assertEqual(self.graph.update(self.task("a", status="Completed")), [])
+        self.assertTrue(self.graph.blocked("c"))
+        self.assertEqual(self.graph.update(self.task("b", status="Completed")), ["c"])
+        self.assertFalse(self.graph.blocked("c"))
+
+        self.assertEqual(self.graph.update(self.task("b")), ["c"])
+        self.assertTrue(self.graph.blocked("c"))
+
+    def test_deleting_prerequisite_unblocks_dependent(self):
+        self.graph.update(self.task("a"))
+        self.graph.update(self.task("c", depends=["a"]))
+        self.assertEqual(self.graph.remove("a"), ["c"])
+        self.assertFalse(self.graph.blocked("c"))
+        self.assertEqual(self.graph.blockers("c"), [])
+
+    def test_prerequisite_added_later_blocks_dependent(self):
+        self.graph.update(self.task("c", depends=["a"]))
+        self.assertFalse(self.graph.blocked("c"))
+        self.assertEqual(self.graph.update(self.task("a")), ["c"])
+        self.assertTrue(self.graph.blocked("c"))
+
+    def test_changing_dependencies_recounts_open_prerequisites(self):
+        self.graph.update(self.task("a"))
+        self.graph.update(self.task("b", status="Completed"))
+        self.graph.update(self.task("c", depends=["a"]))
+        self.graph.update(self.task("c", depends=["b"]))
+        self.assertFalse(self.graph.blocked("c"))
+        self.assertEqual(self.graph.update(self.task("a", status="Completed")), [])
+
+    def test_cycles_are_detected(self):
+        self.graph.update(self.task("a"))
+        self.graph.update(self.task("b", depends=["a"]))
+        self.graph.update(self.task("c", depends=["b"]))
+        self.assertTrue(self.graph.creates_cycle("a", ("c",)))
+        self.assertTrue(self.graph.creates_cycle("a", ("a",)))
+        self.assertFalse(self.graph.creates_cycle("d", ("c",)))
+
+    def test_engine_rejects_cyclic_dependency(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ts.JournalStore(os.path.join(tmp, "tasks.json"), os.path.join(tmp, "tasks.journal"))
+            engine = ts.SchedulerEngine(store, ts.LogSink(), attachments=ts.AttachmentStore(os.path.join(tmp, "attachments")))
+            errors = []
+            engine.on_error = lambda title, message: errors.append(title)
+            try:
+                engine.apply_batch(puts=[self.task("a"), self.task("b", depends=["a"])], persist=False)
+                engine.apply_batch(puts=[self.task("a", depends=["b"])], persist=False)
+                self.assertEqual(errors, ["Dependency Error"])
+                self.assertEqual(engine.tasks["a"].depends, ())
+                self.assertTrue(engine.graph.blocked("b"))
+            finally:
+                engine.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TaskScheduler as ts
+
+
+class JournalStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.tmp.name, "tasks.json")
+        self.journal = os.path.join(self.tmp.name, "tasks.journal")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_store(self):
+        store = ts.JournalStore(self.snapshot, self.journal)
+        ids = [payload["id"] for op, payload in store.iter_records() if op != "delete"]
+        return store, ids
+
+    def test_append_after_torn_record_survives_restart(self):
+        due = time.time() + 3600
+        store, _ = self.open_store()
+        store.put(ts.Task("a", "A", due, 1))
+        store.close(compact=False)
+        with open(self.journal, "ab") as f:
+            f.write(b'{"op":"put","task":{"id":"b","name":"B"')
+
+        store, ids = self.open_store()
+        self.assertEqual(ids, ["a"])
+        store.put(ts.Task("c", "C", due, 1))
+        store.close(compact=False)
+
+        store, ids = self.open_store()
+        store.close(compact=False)
+        self.assertEqual(ids, ["a", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()
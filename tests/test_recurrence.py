@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TaskScheduler as ts
+
+
+def due(day, hour="09:00"):
+    return ts.parse_due(day, hour)
+
+
+class RecurrenceTest(unittest.TestCase):
+    def test_monthly_clamps_to_month_end(self):
+        recurrence = ts.Recurrence("monthly", due("2031-01-31"))
+        self.assertEqual(recurrence.occurrence(1), due("2031-02-28"))
+        self.assertEqual(recurrence.occurrence(2), due("2031-03-31"))
+        self.assertEqual(recurrence.occurrence(3), due("2031-04-30"))
+        self.assertEqual(recurrence.first_after(due("2031-02-01"), 0), (1, due("2031-02-28")))
+
+    def test_first_after_skips_missed_occurrences(self):
+        recurrence = ts.Recurrence("weekly", due("2031-01-01"), interval=2)
+        self.assertEqual(recurrence.first_after(due("2031-03-01"), 0), (5, due("2031-03-12")))
+        self.assertEqual(recurrence.first_after(due("2031-01-01"), 0), (1, due("2031-01-15")))
+
+    def test_count_limits_occurrences(self):
+        recurrence = ts.Recurrence("daily", due("2031-01-01"), count=3)
+        self.assertEqual(recurrence.first_after(due("2031-01-02", "12:00"), 0), (2, due("2031-01-03")))
+        self.assertIsNone(recurrence.first_after(due("2031-01-03"), 0))
+
+    def test_until_limits_occurrences(self):
+        recurrence = ts.Recurrence.from_dict({"freq": "monthly", "start": "2031-01-15 09:00", "until": "2031-03-15"})
+        self.assertEqual(recurrence.first_after(due("2031-02-20"), 0), (2, due("2031-03-15")))
+        self.assertIsNone(recurrence.first_after(due("2031-03-15"), 0))
+
+    def test_invalid_recurrence_is_dropped_on_load(self):
+        task = ts.validate_task({
+            "id": "a", "name": "A", "due_date": "2031-01-01", "due_time": "09:00", "priority": "Low",
+            "status": "Pending", "recurrence": {"freq": "hourly", "start": "2031-01-01 09:00"}, "occurrence": 1
+        })
+        self.assertIsNotNone(task)
+        self.assertIsNone(task.recurrence)
+
+
+if __name__ == "__main__":
+    unittest.main()
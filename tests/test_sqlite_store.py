@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TaskScheduler as ts
+
+
+class SqliteTaskStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tasks.db")
+        self.due = ts.parse_due("2031-01-01", "09:00")
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.tmp.cleanup()
+
+    def open_store(self):
+        store = ts.SqliteTaskStore(self.path)
+        self.stores.append(store)
+        return store
+
+    def loaded(self, store):
+        return {payload["id"]: payload["name"] for payload in store.load()}
+
+    def test_poll_reports_changes_from_another_connection(self):
+        first, second = self.open_store(), self.open_store()
+        first.write_batch([ts.Task("a", "A", self.due, 1), ts.Task("b", "B", self.due, 2)])
+        self.assertEqual(self.loaded(second), {"a": "A", "b": "B"})
+        self.assertEqual(second.poll(), [])
+
+        first.write_batch([ts.Task("a", "A2", self.due, 1)], ["b"])
+        changes = second.poll()
+        self.assertEqual(sorted((op, getattr(item, "name", item)) for op, item in changes), [("delete", "b"), ("put", "A2")])
+        self.assertEqual(second.poll(), [])
+
+    def test_reset_rewrites_only_rows_it_owns(self):
+        first, second = self.open_store(), self.open_store()
+        first.write_batch([ts.Task(task_id, task_id.upper(), self.due, 1) for task_id in "abc"])
+        self.loaded(second)
+        first.put(ts.Task("b", "B from first", self.due, 1))
+        first.put(ts.Task("d", "D", self.due, 1))
+
+        second.reset([ts.Task("a", "A edited", self.due, 1), ts.Task("b", "B from second", self.due, 1)], compact=True)
+        self.assertEqual(self.loaded(self.open_store()), {"a": "A edited", "b": "B from first", "d": "D"})
+
+    def test_reset_without_compact_leaves_rows_alone(self):
+        store = self.open_store()
+        store.write_batch([ts.Task("a", "A", self.due, 1)])
+        store.reset([], compact=False)
+        self.assertEqual(self.loaded(store), {"a": "A"})
+
+    def test_next_pending_and_due_within_use_pending_rows(self):
+        store = self.open_store()
+        now = time.time()
+        store.write_batch([
+            ts.Task("a", "A", now + 600, 2),
+            ts.Task("b", "B", now + 7200, 1),
+            ts.Task("c", "C", now + 300, 1, "Completed")
+        ])
+        self.assertEqual([payload["id"] for payload in store.next_pending(5)], ["b", "a"])
+        self.assertEqual([payload["id"] for payload in store.due_within(3600)], ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
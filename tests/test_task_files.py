@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TaskScheduler as ts
+
+
+class TaskFileTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        due = ts.parse_due("2031-01-31", "09:30")
+        self.tasks = [
+            ts.Task("a", "Report, draft \"v2\"", due, 1, description="line one\nline two", remind=[7200, 600]),
+            ts.Task("b", "Review", due + 86400, 3, "Completed", depends=["a"],
+                    recurrence=ts.Recurrence("monthly", due, count=4), occurrence=2),
+            ts.Task("c", "Rest", due + 3600, 2, files=[{"name": "notes.txt", "sha256": "0" * 64}])
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def round_trip(self, name):
+        path = os.path.join(self.tmp.name, name)
+        self.assertEqual(ts.write_task_file(path, self.tasks), 3)
+        return ts.read_task_file(path)
+
+    def assert_same(self, loaded):
+        self.assertEqual([task.to_dict() for task in loaded], [task.to_dict() for task in self.tasks])
+
+    def test_csv_round_trip(self):
+        self.assert_same(self.round_trip("tasks.csv"))
+
+    def test_json_round_trip(self):
+        self.assert_same(self.round_trip("tasks.json"))
+
+    def test_duplicate_ids_are_renamed_and_invalid_rows_skipped(self):
+        path = os.path.join(self.tmp.name, "tasks.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('[{"id": "a", "name": "A", "due_date": "2031-01-01", "due_time": "09:00", "priority": "Low", "status": "Pending"},'
+                    ' {"id": "a", "name": "B", "due_date": "2031-01-01", "due_time": "09:00", "priority": "Low", "status": "Pending"},'
+                    ' {"id": "c", "name": "", "due_date": "2031-01-01", "due_time": "09:00", "priority": "Low", "status": "Pending"}]')
+        loaded = ts.read_task_file(path)
+        self.assertEqual([task.name for task in loaded], ["A", "B"])
+        self.assertEqual(loaded[0].id, "a")
+        self.assertNotEqual(loaded[1].id, "a")
+
+    def test_unsupported_extension_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ts.write_task_file(os.path.join(self.tmp.name, "tasks.txt"), self.tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import TaskScheduler as ts
+
+WORDS = "alpha beta gamma delta report review revenue rest".split()
+
+
+class TaskIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(11)
+        self.base = ts.parse_due("2030-01-01", "10:00")
+        self.tasks = {}
+        for i in range(600):
+            task = ts.Task(f"id{i}", "", 0, 1)
+            self.shuffle(task)
+            self.tasks[task.id] = task
+        self.index = ts.TaskIndex()
+        self.index.rebuild(self.tasks.values())
+        self.view = ts.TaskListView()
+        self.view.rebuild(self.tasks.values())
+
+    def shuffle(self, task):
+        task.name = " ".join(self.rng.choices(WORDS, k=2))
+        task.due = self.base + self.rng.randint(0, 60) * 86400
+        task.priority = self.rng.randint(1, 3)
+        task.status = self.rng.choice(["Pending", "Completed"])
+
+    def expected(self, query):
+        return sorted(self.view.key_by_id[task.id] for task in self.tasks.values() if query.matches(task))
+
+    def random_query(self):
+        return ts.TaskFilter(
+            self.rng.choice(["", "re", "rev", "review", "al", "alpha be"]),
+            self.rng.choice([None, "Pending"]),
+            self.rng.choice([None, 1, 2, 3]),
+            self.rng.choice([None, self.base + 10 * 86400]),
+            self.rng.choice([None, self.base + 40 * 86400])
+        )
+
+    def test_search_matches_linear_filter_after_updates(self):
+        for _ in range(30):
+            query = self.random_query()
+            self.assertEqual(self.index.search(query), {key[-1] for key in self.expected(query)})
+            changed = self.rng.sample(list(self.tasks.values()), 10)
+            for task in changed:
+                self.shuffle(task)
+            removed = self.rng.sample(list(self.tasks), 3)
+            for task_id in removed:
+                del self.tasks[task_id]
+            self.index.update([task for task in changed if task.id in self.tasks], removed)
+
+    def test_short_prefix_matches_whole_words_only(self):
+        query = ts.TaskFilter("re")
+        self.assertEqual(self.index.search(query), set())
+        self.assertEqual(self.expected(query), [])
+
+    def test_filtered_view_tracks_incremental_changes(self):
+        for _ in range(20):
+            query = self.random_query()
+            if not query.active:
+                continue
+            filtered = ts.FilteredListView(self.view, self.index.search(query), query)
+            filtered.window(0, 20)
+            for step in range(40):
+                task = self.tasks[f"id{self.rng.randrange(600)}"]
+                self.shuffle(task)
+                self.view.insert_many([task])
+                self.index.update([task])
+                if query.matches(task):
+                    filtered.insert_many([task])
+                else:
+                    filtered.remove_many([task.id])
+                if step % 10 == 0:
+                    expected = [key[-1] for key in self.expected(query)]
+                    self.assertEqual(len(filtered), len(expected))
+                    for start in (0, 7, len(expected) // 2, max(0, len(expected) - 20)):
+                        self.assertEqual(filtered.window(start, 20), expected[start:start + 20])
+
+
+if __name__ == "__main__":
+    unittest.main()